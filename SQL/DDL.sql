@@ -128,6 +128,47 @@ CREATE TABLE builds (
     CONSTRAINT fk_build_ssd FOREIGN KEY (ssd_id) REFERENCES ssds (id) ON DELETE SET NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+CREATE TABLE build_summaries (
+    build_id INT NOT NULL,
+    build_name VARCHAR(255) NOT NULL,
+    cpu_id INT,
+    gpu_id INT,
+    motherboard_id INT,
+    ram_id INT,
+    psu_id INT,
+    case_id INT,
+    ssd_id INT,
+    display_id INT,
+    cpu VARCHAR(255),
+    gpu VARCHAR(255),
+    motherboard VARCHAR(255),
+    ram VARCHAR(255),
+    psu VARCHAR(255),
+    case_name VARCHAR(255),
+    ssd_name VARCHAR(255),
+    display_name VARCHAR(255),
+    total_price DECIMAL(12,2) NOT NULL DEFAULT 0,
+    total_power_estimate DECIMAL(10,2) NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (build_id),
+    KEY idx_summary_created (created_at, build_id),
+    KEY idx_summary_price (total_price, build_id),
+    KEY idx_summary_power (total_power_estimate, build_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE build_part_sort (
+    build_id INT NOT NULL,
+    category VARCHAR(20) NOT NULL,
+    part_id INT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    total_price DECIMAL(12,2) NOT NULL DEFAULT 0,
+    total_power_estimate DECIMAL(10,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (build_id, category),
+    KEY idx_part_sort_created (category, part_id, created_at, build_id),
+    KEY idx_part_sort_price (category, part_id, total_price, build_id),
+    KEY idx_part_sort_power (category, part_id, total_power_estimate, build_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 CREATE TABLE cpu_motherboard_socket_map (
     map_id INT NOT NULL AUTO_INCREMENT,
     cpu_id INT NOT NULL,
@@ -162,4 +203,32 @@ CREATE TABLE motherboard_case_formfactor_map (
     KEY case_id (case_id),
     CONSTRAINT motherboard_case_formfactor_map_ibfk_1 FOREIGN KEY (motherboard_id) REFERENCES motherboards (id) ON DELETE CASCADE,
     CONSTRAINT motherboard_case_formfactor_map_ibfk_2 FOREIGN KEY (case_id) REFERENCES cases (id) ON DELETE CASCADE
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
\ No newline at end of file
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+CREATE TABLE jobs (
+    job_id INT NOT NULL AUTO_INCREMENT,
+    job_type VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    params JSON,
+    state JSON,
+    processed INT NOT NULL DEFAULT 0,
+    total INT,
+    active_seconds DOUBLE NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL,
+    updated_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_id),
+    KEY idx_jobs_status (status),
+    CONSTRAINT chk_job_status CHECK (status IN ('queued', 'running', 'completed', 'failed', 'cancelled'))
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE job_results (
+    job_id INT NOT NULL,
+    build_id INT NOT NULL,
+    check_name VARCHAR(20) NOT NULL,
+    verdict VARCHAR(255),
+    PRIMARY KEY (job_id, build_id, check_name),
+    CONSTRAINT fk_job_results_job FOREIGN KEY (job_id) REFERENCES jobs (job_id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
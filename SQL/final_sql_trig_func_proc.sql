@@ -136,6 +136,49 @@ CREATE TABLE builds (
     CONSTRAINT fk_build_ssd FOREIGN KEY (ssd_id) REFERENCES ssds (id) ON DELETE SET NULL
 ) ENGINE=InnoDB AUTO_INCREMENT=45 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+DROP TABLE IF EXISTS build_summaries;
+CREATE TABLE build_summaries (
+    build_id INT NOT NULL,
+    build_name VARCHAR(255) NOT NULL,
+    cpu_id INT,
+    gpu_id INT,
+    motherboard_id INT,
+    ram_id INT,
+    psu_id INT,
+    case_id INT,
+    ssd_id INT,
+    display_id INT,
+    cpu VARCHAR(255),
+    gpu VARCHAR(255),
+    motherboard VARCHAR(255),
+    ram VARCHAR(255),
+    psu VARCHAR(255),
+    case_name VARCHAR(255),
+    ssd_name VARCHAR(255),
+    display_name VARCHAR(255),
+    total_price DECIMAL(12,2) NOT NULL DEFAULT 0,
+    total_power_estimate DECIMAL(10,2) NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (build_id),
+    KEY idx_summary_created (created_at, build_id),
+    KEY idx_summary_price (total_price, build_id),
+    KEY idx_summary_power (total_power_estimate, build_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+DROP TABLE IF EXISTS build_part_sort;
+CREATE TABLE build_part_sort (
+    build_id INT NOT NULL,
+    category VARCHAR(20) NOT NULL,
+    part_id INT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    total_price DECIMAL(12,2) NOT NULL DEFAULT 0,
+    total_power_estimate DECIMAL(10,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (build_id, category),
+    KEY idx_part_sort_created (category, part_id, created_at, build_id),
+    KEY idx_part_sort_price (category, part_id, total_price, build_id),
+    KEY idx_part_sort_power (category, part_id, total_power_estimate, build_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 DROP TABLE IF EXISTS cpu_motherboard_socket_map;
 CREATE TABLE cpu_motherboard_socket_map (
     map_id INT NOT NULL AUTO_INCREMENT,
@@ -175,6 +218,36 @@ CREATE TABLE motherboard_case_formfactor_map (
     CONSTRAINT motherboard_case_formfactor_map_ibfk_2 FOREIGN KEY (case_id) REFERENCES cases (id) ON DELETE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=10 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
+DROP TABLE IF EXISTS job_results;
+DROP TABLE IF EXISTS jobs;
+CREATE TABLE jobs (
+    job_id INT NOT NULL AUTO_INCREMENT,
+    job_type VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    params JSON,
+    state JSON,
+    processed INT NOT NULL DEFAULT 0,
+    total INT,
+    active_seconds DOUBLE NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL,
+    updated_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_id),
+    KEY idx_jobs_status (status),
+    CONSTRAINT chk_job_status CHECK (status IN ('queued', 'running', 'completed', 'failed', 'cancelled'))
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE job_results (
+    job_id INT NOT NULL,
+    build_id INT NOT NULL,
+    check_name VARCHAR(20) NOT NULL,
+    verdict VARCHAR(255),
+    PRIMARY KEY (job_id, build_id, check_name),
+    CONSTRAINT fk_job_results_job FOREIGN KEY (job_id) REFERENCES jobs (job_id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 DELIMITER $$
 
 -- Calculates estimated power consumption when a new build is inserted.
@@ -869,4 +942,476 @@ BEGIN
     COMMIT;
 END$$
 
-DELIMITER ;
\ No newline at end of file
+DELIMITER ;
+
+
+-- ------------------------------------------------------
+-- Build summaries: denormalized listing rows for the paginated builds API
+-- ------------------------------------------------------
+
+-- One row per build with part names, total price and power already resolved.
+CREATE OR REPLACE VIEW build_summary_source AS
+SELECT
+    b.build_id,
+    b.build_name,
+    b.cpu_id, b.gpu_id, b.motherboard_id, b.ram_id, b.psu_id, b.case_id, b.ssd_id, b.display_id,
+    c.name AS cpu,
+    g.name AS gpu,
+    m.name AS motherboard,
+    r.name AS ram,
+    p.name AS psu,
+    cs.name AS case_name,
+    s.name AS ssd_name,
+    d.name AS display_name,
+    COALESCE(c.price, 0) + COALESCE(g.price, 0) + COALESCE(m.price, 0) + COALESCE(r.price, 0)
+        + COALESCE(p.price, 0) + COALESCE(cs.price, 0) + COALESCE(s.price, 0) + COALESCE(d.price, 0) AS total_price,
+    COALESCE(b.total_power_estimate, 0) AS total_power_estimate,
+    COALESCE(b.created_at, CURRENT_TIMESTAMP) AS created_at
+FROM builds b
+LEFT JOIN cpus c ON b.cpu_id = c.id
+LEFT JOIN gpus g ON b.gpu_id = g.id
+LEFT JOIN motherboards m ON b.motherboard_id = m.id
+LEFT JOIN ram r ON b.ram_id = r.id
+LEFT JOIN psus p ON b.psu_id = p.id
+LEFT JOIN cases cs ON b.case_id = cs.id
+LEFT JOIN ssds s ON b.ssd_id = s.id
+LEFT JOIN displays d ON b.display_id = d.id;
+
+DELIMITER $$
+
+-- Recomputes the summary row of a single build, and its build_part_sort rows.
+CREATE PROCEDURE `refresh_build_summary`(IN p_build_id INT)
+BEGIN
+    REPLACE INTO build_summaries (
+        build_id, build_name,
+        cpu_id, gpu_id, motherboard_id, ram_id, psu_id, case_id, ssd_id, display_id,
+        cpu, gpu, motherboard, ram, psu, case_name, ssd_name, display_name,
+        total_price, total_power_estimate, created_at
+    )
+    SELECT
+        build_id, build_name,
+        cpu_id, gpu_id, motherboard_id, ram_id, psu_id, case_id, ssd_id, display_id,
+        cpu, gpu, motherboard, ram, psu, case_name, ssd_name, display_name,
+        total_price, total_power_estimate, created_at
+    FROM build_summary_source
+    WHERE build_id = p_build_id;
+
+    DELETE FROM build_part_sort WHERE build_id = p_build_id;
+    INSERT INTO build_part_sort (build_id, category, part_id, created_at, total_price, total_power_estimate)
+    SELECT build_id, 'cpus', cpu_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE build_id = p_build_id AND cpu_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'gpus', gpu_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE build_id = p_build_id AND gpu_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'motherboards', motherboard_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE build_id = p_build_id AND motherboard_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'ram', ram_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE build_id = p_build_id AND ram_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'psus', psu_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE build_id = p_build_id AND psu_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'cases', case_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE build_id = p_build_id AND case_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'ssds', ssd_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE build_id = p_build_id AND ssd_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'displays', display_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE build_id = p_build_id AND display_id IS NOT NULL;
+END$$
+
+-- Rebuilds every summary and build_part_sort row from scratch (initial backfill / repair).
+CREATE PROCEDURE `rebuild_build_summaries`()
+BEGIN
+    DELETE FROM build_part_sort;
+    DELETE FROM build_summaries;
+    INSERT INTO build_summaries (
+        build_id, build_name,
+        cpu_id, gpu_id, motherboard_id, ram_id, psu_id, case_id, ssd_id, display_id,
+        cpu, gpu, motherboard, ram, psu, case_name, ssd_name, display_name,
+        total_price, total_power_estimate, created_at
+    )
+    SELECT
+        build_id, build_name,
+        cpu_id, gpu_id, motherboard_id, ram_id, psu_id, case_id, ssd_id, display_id,
+        cpu, gpu, motherboard, ram, psu, case_name, ssd_name, display_name,
+        total_price, total_power_estimate, created_at
+    FROM build_summary_source;
+
+    INSERT INTO build_part_sort (build_id, category, part_id, created_at, total_price, total_power_estimate)
+    SELECT build_id, 'cpus', cpu_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE cpu_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'gpus', gpu_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE gpu_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'motherboards', motherboard_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE motherboard_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'ram', ram_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE ram_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'psus', psu_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE psu_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'cases', case_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE case_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'ssds', ssd_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE ssd_id IS NOT NULL
+    UNION ALL
+    SELECT build_id, 'displays', display_id, created_at, total_price, total_power_estimate
+    FROM build_summaries WHERE display_id IS NOT NULL;
+END$$
+
+-- Keeps build_summaries in sync when a build is created.
+CREATE TRIGGER trg_after_insert_build_summary
+AFTER INSERT ON builds
+FOR EACH ROW
+BEGIN
+    CALL refresh_build_summary(NEW.build_id);
+END$$
+
+-- Keeps build_summaries in sync when a build is edited or its power is re-estimated.
+CREATE TRIGGER trg_after_update_build_summary
+AFTER UPDATE ON builds
+FOR EACH ROW
+BEGIN
+    CALL refresh_build_summary(NEW.build_id);
+END$$
+
+-- Removes the summary rows of a deleted build.
+CREATE TRIGGER trg_after_delete_build_summary
+AFTER DELETE ON builds
+FOR EACH ROW
+BEGIN
+    DELETE FROM build_summaries WHERE build_id = OLD.build_id;
+    DELETE FROM build_part_sort WHERE build_id = OLD.build_id;
+END$$
+
+-- Propagates cpus name/price changes to the summaries of builds using that part
+-- (found through the builds.cpu_id foreign key index).
+CREATE TRIGGER trg_after_update_cpus_summary
+AFTER UPDATE ON cpus
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.name <=> OLD.name) OR NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_summaries s
+        JOIN builds b ON b.build_id = s.build_id
+        SET s.cpu = NEW.name,
+            s.total_price = s.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.cpu_id = NEW.id;
+    END IF;
+    IF NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_part_sort ps
+        JOIN builds b ON b.build_id = ps.build_id
+        SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.cpu_id = NEW.id;
+    END IF;
+END$$
+
+-- Mirrors ON DELETE SET NULL on builds.cpu_id, which does not fire builds triggers.
+-- BEFORE DELETE so the builds still reference the part.
+CREATE TRIGGER trg_before_delete_cpus_summary
+BEFORE DELETE ON cpus
+FOR EACH ROW
+BEGIN
+    UPDATE build_summaries s
+    JOIN builds b ON b.build_id = s.build_id
+    SET s.cpu_id = NULL,
+        s.cpu = NULL,
+        s.total_price = s.total_price - COALESCE(OLD.price, 0)
+    WHERE b.cpu_id = OLD.id;
+    UPDATE build_part_sort ps
+    JOIN builds b ON b.build_id = ps.build_id
+    SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0)
+    WHERE b.cpu_id = OLD.id;
+    DELETE FROM build_part_sort WHERE category = 'cpus' AND part_id = OLD.id;
+END$$
+
+-- Propagates gpus name/price changes to the summaries of builds using that part
+-- (found through the builds.gpu_id foreign key index).
+CREATE TRIGGER trg_after_update_gpus_summary
+AFTER UPDATE ON gpus
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.name <=> OLD.name) OR NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_summaries s
+        JOIN builds b ON b.build_id = s.build_id
+        SET s.gpu = NEW.name,
+            s.total_price = s.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.gpu_id = NEW.id;
+    END IF;
+    IF NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_part_sort ps
+        JOIN builds b ON b.build_id = ps.build_id
+        SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.gpu_id = NEW.id;
+    END IF;
+END$$
+
+-- Mirrors ON DELETE SET NULL on builds.gpu_id, which does not fire builds triggers.
+-- BEFORE DELETE so the builds still reference the part.
+CREATE TRIGGER trg_before_delete_gpus_summary
+BEFORE DELETE ON gpus
+FOR EACH ROW
+BEGIN
+    UPDATE build_summaries s
+    JOIN builds b ON b.build_id = s.build_id
+    SET s.gpu_id = NULL,
+        s.gpu = NULL,
+        s.total_price = s.total_price - COALESCE(OLD.price, 0)
+    WHERE b.gpu_id = OLD.id;
+    UPDATE build_part_sort ps
+    JOIN builds b ON b.build_id = ps.build_id
+    SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0)
+    WHERE b.gpu_id = OLD.id;
+    DELETE FROM build_part_sort WHERE category = 'gpus' AND part_id = OLD.id;
+END$$
+
+-- Propagates motherboards name/price changes to the summaries of builds using that part
+-- (found through the builds.motherboard_id foreign key index).
+CREATE TRIGGER trg_after_update_motherboards_summary
+AFTER UPDATE ON motherboards
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.name <=> OLD.name) OR NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_summaries s
+        JOIN builds b ON b.build_id = s.build_id
+        SET s.motherboard = NEW.name,
+            s.total_price = s.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.motherboard_id = NEW.id;
+    END IF;
+    IF NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_part_sort ps
+        JOIN builds b ON b.build_id = ps.build_id
+        SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.motherboard_id = NEW.id;
+    END IF;
+END$$
+
+-- Mirrors ON DELETE SET NULL on builds.motherboard_id, which does not fire builds triggers.
+-- BEFORE DELETE so the builds still reference the part.
+CREATE TRIGGER trg_before_delete_motherboards_summary
+BEFORE DELETE ON motherboards
+FOR EACH ROW
+BEGIN
+    UPDATE build_summaries s
+    JOIN builds b ON b.build_id = s.build_id
+    SET s.motherboard_id = NULL,
+        s.motherboard = NULL,
+        s.total_price = s.total_price - COALESCE(OLD.price, 0)
+    WHERE b.motherboard_id = OLD.id;
+    UPDATE build_part_sort ps
+    JOIN builds b ON b.build_id = ps.build_id
+    SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0)
+    WHERE b.motherboard_id = OLD.id;
+    DELETE FROM build_part_sort WHERE category = 'motherboards' AND part_id = OLD.id;
+END$$
+
+-- Propagates ram name/price changes to the summaries of builds using that part
+-- (found through the builds.ram_id foreign key index).
+CREATE TRIGGER trg_after_update_ram_summary
+AFTER UPDATE ON ram
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.name <=> OLD.name) OR NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_summaries s
+        JOIN builds b ON b.build_id = s.build_id
+        SET s.ram = NEW.name,
+            s.total_price = s.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.ram_id = NEW.id;
+    END IF;
+    IF NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_part_sort ps
+        JOIN builds b ON b.build_id = ps.build_id
+        SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.ram_id = NEW.id;
+    END IF;
+END$$
+
+-- Mirrors ON DELETE SET NULL on builds.ram_id, which does not fire builds triggers.
+-- BEFORE DELETE so the builds still reference the part.
+CREATE TRIGGER trg_before_delete_ram_summary
+BEFORE DELETE ON ram
+FOR EACH ROW
+BEGIN
+    UPDATE build_summaries s
+    JOIN builds b ON b.build_id = s.build_id
+    SET s.ram_id = NULL,
+        s.ram = NULL,
+        s.total_price = s.total_price - COALESCE(OLD.price, 0)
+    WHERE b.ram_id = OLD.id;
+    UPDATE build_part_sort ps
+    JOIN builds b ON b.build_id = ps.build_id
+    SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0)
+    WHERE b.ram_id = OLD.id;
+    DELETE FROM build_part_sort WHERE category = 'ram' AND part_id = OLD.id;
+END$$
+
+-- Propagates psus name/price changes to the summaries of builds using that part
+-- (found through the builds.psu_id foreign key index).
+CREATE TRIGGER trg_after_update_psus_summary
+AFTER UPDATE ON psus
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.name <=> OLD.name) OR NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_summaries s
+        JOIN builds b ON b.build_id = s.build_id
+        SET s.psu = NEW.name,
+            s.total_price = s.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.psu_id = NEW.id;
+    END IF;
+    IF NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_part_sort ps
+        JOIN builds b ON b.build_id = ps.build_id
+        SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.psu_id = NEW.id;
+    END IF;
+END$$
+
+-- Mirrors ON DELETE SET NULL on builds.psu_id, which does not fire builds triggers.
+-- BEFORE DELETE so the builds still reference the part.
+CREATE TRIGGER trg_before_delete_psus_summary
+BEFORE DELETE ON psus
+FOR EACH ROW
+BEGIN
+    UPDATE build_summaries s
+    JOIN builds b ON b.build_id = s.build_id
+    SET s.psu_id = NULL,
+        s.psu = NULL,
+        s.total_price = s.total_price - COALESCE(OLD.price, 0)
+    WHERE b.psu_id = OLD.id;
+    UPDATE build_part_sort ps
+    JOIN builds b ON b.build_id = ps.build_id
+    SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0)
+    WHERE b.psu_id = OLD.id;
+    DELETE FROM build_part_sort WHERE category = 'psus' AND part_id = OLD.id;
+END$$
+
+-- Propagates cases name/price changes to the summaries of builds using that part
+-- (found through the builds.case_id foreign key index).
+CREATE TRIGGER trg_after_update_cases_summary
+AFTER UPDATE ON cases
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.name <=> OLD.name) OR NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_summaries s
+        JOIN builds b ON b.build_id = s.build_id
+        SET s.case_name = NEW.name,
+            s.total_price = s.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.case_id = NEW.id;
+    END IF;
+    IF NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_part_sort ps
+        JOIN builds b ON b.build_id = ps.build_id
+        SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.case_id = NEW.id;
+    END IF;
+END$$
+
+-- Mirrors ON DELETE SET NULL on builds.case_id, which does not fire builds triggers.
+-- BEFORE DELETE so the builds still reference the part.
+CREATE TRIGGER trg_before_delete_cases_summary
+BEFORE DELETE ON cases
+FOR EACH ROW
+BEGIN
+    UPDATE build_summaries s
+    JOIN builds b ON b.build_id = s.build_id
+    SET s.case_id = NULL,
+        s.case_name = NULL,
+        s.total_price = s.total_price - COALESCE(OLD.price, 0)
+    WHERE b.case_id = OLD.id;
+    UPDATE build_part_sort ps
+    JOIN builds b ON b.build_id = ps.build_id
+    SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0)
+    WHERE b.case_id = OLD.id;
+    DELETE FROM build_part_sort WHERE category = 'cases' AND part_id = OLD.id;
+END$$
+
+-- Propagates ssds name/price changes to the summaries of builds using that part
+-- (found through the builds.ssd_id foreign key index).
+CREATE TRIGGER trg_after_update_ssds_summary
+AFTER UPDATE ON ssds
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.name <=> OLD.name) OR NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_summaries s
+        JOIN builds b ON b.build_id = s.build_id
+        SET s.ssd_name = NEW.name,
+            s.total_price = s.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.ssd_id = NEW.id;
+    END IF;
+    IF NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_part_sort ps
+        JOIN builds b ON b.build_id = ps.build_id
+        SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.ssd_id = NEW.id;
+    END IF;
+END$$
+
+-- Mirrors ON DELETE SET NULL on builds.ssd_id, which does not fire builds triggers.
+-- BEFORE DELETE so the builds still reference the part.
+CREATE TRIGGER trg_before_delete_ssds_summary
+BEFORE DELETE ON ssds
+FOR EACH ROW
+BEGIN
+    UPDATE build_summaries s
+    JOIN builds b ON b.build_id = s.build_id
+    SET s.ssd_id = NULL,
+        s.ssd_name = NULL,
+        s.total_price = s.total_price - COALESCE(OLD.price, 0)
+    WHERE b.ssd_id = OLD.id;
+    UPDATE build_part_sort ps
+    JOIN builds b ON b.build_id = ps.build_id
+    SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0)
+    WHERE b.ssd_id = OLD.id;
+    DELETE FROM build_part_sort WHERE category = 'ssds' AND part_id = OLD.id;
+END$$
+
+-- Propagates displays name/price changes to the summaries of builds using that part
+-- (found through the builds.display_id foreign key index).
+CREATE TRIGGER trg_after_update_displays_summary
+AFTER UPDATE ON displays
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.name <=> OLD.name) OR NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_summaries s
+        JOIN builds b ON b.build_id = s.build_id
+        SET s.display_name = NEW.name,
+            s.total_price = s.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.display_id = NEW.id;
+    END IF;
+    IF NOT (NEW.price <=> OLD.price) THEN
+        UPDATE build_part_sort ps
+        JOIN builds b ON b.build_id = ps.build_id
+        SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0)
+        WHERE b.display_id = NEW.id;
+    END IF;
+END$$
+
+-- Mirrors ON DELETE SET NULL on builds.display_id, which does not fire builds triggers.
+-- BEFORE DELETE so the builds still reference the part.
+CREATE TRIGGER trg_before_delete_displays_summary
+BEFORE DELETE ON displays
+FOR EACH ROW
+BEGIN
+    UPDATE build_summaries s
+    JOIN builds b ON b.build_id = s.build_id
+    SET s.display_id = NULL,
+        s.display_name = NULL,
+        s.total_price = s.total_price - COALESCE(OLD.price, 0)
+    WHERE b.display_id = OLD.id;
+    UPDATE build_part_sort ps
+    JOIN builds b ON b.build_id = ps.build_id
+    SET ps.total_price = ps.total_price - COALESCE(OLD.price, 0)
+    WHERE b.display_id = OLD.id;
+    DELETE FROM build_part_sort WHERE category = 'displays' AND part_id = OLD.id;
+END$$
+
+DELIMITER ;
+
+CALL rebuild_build_summaries();
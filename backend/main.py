@@ -1,9 +1,22 @@
-from fastapi import FastAPI, HTTPException, Body, Query
+from fastapi import FastAPI, HTTPException, Body, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
+from collections import OrderedDict
+from decimal import Decimal
+import base64
+import csv
+import json
+import math
+import os
+import queue
+import threading
+import time
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
 
 app = FastAPI()
 
@@ -13,6 +26,168 @@ DB_USER = "root"
 DB_PASSWORD = "----------------"
 DB_NAME = "final_build_a_pc"
 
+# Connection pool size (mysql-connector allows at most 32 per pool)
+DB_POOL_SIZE = 32
+
+# Background job worker threads; each holds at most one pooled connection
+JOB_WORKERS = 2
+
+# ========== ADMISSION CONTROL ==========
+
+# Route classes, matched by path prefix in order; anything else is "default"
+ROUTE_CLASSES = [
+    ("search", ("/search/", "/find/", "/compare/", "/fetch/")),
+    ("builder", ("/parts/compatible/", "/compatibility/", "/psus/compatibility", "/power/")),
+    ("builds", ("/builds",)),
+    ("admin", ("/admin/", "/users/", "/auth/")),
+]
+
+# Per client and route class: token refill rate (req/s), burst size, and the
+# share of MAX_CONCURRENT_DB_REQUESTS the class may occupy at once, so search
+# floods can never take every slot away from builder traffic.
+ROUTE_CLASS_LIMITS = {
+    "search": {"rate": 5, "burst": 20, "max_concurrent": 12},
+    "builder": {"rate": 20, "burst": 60, "max_concurrent": 24},
+    "builds": {"rate": 10, "burst": 30, "max_concurrent": 16},
+    "admin": {"rate": 5, "burst": 20, "max_concurrent": 8},
+    "default": {"rate": 10, "burst": 30, "max_concurrent": 8},
+}
+
+# Global cap on requests holding a DB connection; the rest of the pool is
+# reserved for background job workers
+MAX_CONCURRENT_DB_REQUESTS = DB_POOL_SIZE - JOB_WORKERS
+
+# Hard cap on tracked (client, route class) buckets; the least recently used go first
+MAX_TRACKED_BUCKETS = 10000
+
+ADMISSION_EXEMPT_PATHS = {"/admission/stats", "/ready", "/docs", "/redoc", "/openapi.json"}
+
+
+class TokenBucket:
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, now):
+        """Take one token; returns 0 on success, else seconds until a token is available."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """
+    Token-bucket rate limits per (client, route class) plus concurrency caps.
+    Only touched from the event loop (the HTTP middleware), so no locking.
+    """
+
+    def __init__(self):
+        # Least recently used first, capped at MAX_TRACKED_BUCKETS
+        self.buckets = OrderedDict()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.class_in_flight = {name: 0 for name in ROUTE_CLASS_LIMITS}
+        self.counters = {
+            name: {"admitted": 0, "rate_limited": 0, "overloaded": 0}
+            for name in ROUTE_CLASS_LIMITS
+        }
+
+    def classify(self, path):
+        for route_class, prefixes in ROUTE_CLASSES:
+            if path.startswith(prefixes):
+                return route_class
+        return "default"
+
+    def admit(self, client, route_class):
+        """Returns None if admitted, else (status_code, detail, retry_after_seconds)."""
+        limits = ROUTE_CLASS_LIMITS[route_class]
+        now = time.monotonic()
+
+        key = (client, route_class)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(limits["rate"], limits["burst"], now)
+            if len(self.buckets) > MAX_TRACKED_BUCKETS:
+                # O(1) per request however many clients show up
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+        wait = bucket.take(now)
+        if wait:
+            self.counters[route_class]["rate_limited"] += 1
+            return 429, "Too many requests", max(1, math.ceil(wait))
+
+        if self.in_flight >= MAX_CONCURRENT_DB_REQUESTS or self.class_in_flight[route_class] >= limits["max_concurrent"]:
+            # Give the token back: the request was never served
+            bucket.tokens += 1
+            self.counters[route_class]["overloaded"] += 1
+            return 503, "Server busy, please retry", 1
+
+        self.in_flight += 1
+        self.class_in_flight[route_class] += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.counters[route_class]["admitted"] += 1
+        return None
+
+    def release(self, route_class):
+        self.in_flight -= 1
+        self.class_in_flight[route_class] -= 1
+
+    def stats(self):
+        return {
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "max_concurrent_db_requests": MAX_CONCURRENT_DB_REQUESTS,
+            "tracked_buckets": len(self.buckets),
+            "classes": {
+                name: {
+                    **self.counters[name],
+                    "in_flight": self.class_in_flight[name],
+                    "limits": ROUTE_CLASS_LIMITS[name],
+                }
+                for name in ROUTE_CLASS_LIMITS
+            },
+        }
+
+
+admission = AdmissionController()
+
+
+# Registered before CORSMiddleware so CORS stays outermost and 429/503
+# responses still carry the CORS headers the frontend needs to read them.
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    path = request.url.path
+    if request.method == "OPTIONS" or path in ADMISSION_EXEMPT_PATHS:
+        return await call_next(request)
+
+    route_class = admission.classify(path)
+    client = request.client.host if request.client else "unknown"
+    rejection = admission.admit(client, route_class)
+    if rejection:
+        status_code, detail, retry_after = rejection
+        return JSONResponse(
+            status_code=status_code,
+            content={"detail": detail},
+            headers={"Retry-After": str(retry_after)}
+        )
+    try:
+        return await call_next(request)
+    finally:
+        admission.release(route_class)
+
+
+@app.get("/admission/stats")
+def get_admission_stats():
+    """Admission-control counters and limits, for tuning ROUTE_CLASS_LIMITS."""
+    return admission.stats()
+
+
 origins=[
     "http://localhost:3000"
 ]
@@ -52,6 +227,30 @@ class BuildUpdate(BaseModel):
     ssd_id: Optional[int] = None
     display_id: Optional[int] = None
 
+# Sortable columns of build_summaries exposed by GET /builds
+BUILD_SORT_COLUMNS = ["created_at", "total_price", "total_power_estimate"]
+
+# Part category -> build_summaries column, for the "builds containing part X" filter
+BUILD_PART_COLUMNS = {
+    "cpus": "cpu_id",
+    "gpus": "gpu_id",
+    "motherboards": "motherboard_id",
+    "ram": "ram_id",
+    "psus": "psu_id",
+    "cases": "case_id",
+    "ssds": "ssd_id",
+    "displays": "display_id",
+}
+
+MAX_BUILDS_PAGE_SIZE = 100
+
+# Bulk build creation limits: builds per request, and rows per INSERT/transaction
+MAX_BULK_BUILDS = 1000
+BULK_INSERT_CHUNK_SIZE = 200
+
+class BulkBuildCreate(BaseModel):
+    builds: List[BuildCreate]
+
 class BuildState(BaseModel):
     cpu_id: Optional[int] = None
     motherboard_id: Optional[int] = None
@@ -60,14 +259,279 @@ class BuildState(BaseModel):
     case_id: Optional[int] = None
     psu_id: Optional[int] = None
 
+# BuildState slots each category's get_compatible_parts result depends on
+COMPATIBLE_PART_DEPENDENCIES = {
+    "cpus": ("motherboard_id",),
+    "motherboards": ("cpu_id", "case_id"),
+    "cases": ("motherboard_id",),
+    "psus": ("gpu_id", "case_id"),
+    "gpus": (),
+    "ram": (),
+    "ssds": (),
+    "displays": (),
+}
+
+COMPATIBLE_PART_SLOTS = ("cpu_id", "motherboard_id", "ram_id", "gpu_id", "case_id", "psu_id")
+
+# Pairwise checks pushed by the builder session; keys match BuilderPage's COMPAT_MAP
+BUILDER_CHECKS = {
+    "cpu_mb": (("cpu", "cpu_id"), ("motherboard", "motherboard_id")),
+    "mb_case": (("motherboard", "motherboard_id"), ("case", "case_id")),
+    "gpu_psu": (("gpu", "gpu_id"), ("psu", "psu_id")),
+}
+
+# SQL shared by the endpoints and the startup warmup, so the statements
+# prepared at startup are exactly the ones the endpoints execute
+FETCHABLE_TABLES = ["cpus", "gpus", "motherboards", "ram", "psus", "cases", "ssds", "displays", "builds"]
+FETCH_COUNT_SQL = "SELECT COUNT(*) as total FROM {table}"
+FETCH_PAGE_SQL = "SELECT * FROM {table} LIMIT %s OFFSET %s"
+FETCH_ITEM_SQL = "SELECT * FROM {table} WHERE {pk} = %s"
+CHECK_COMPATIBILITY_SQL = "SELECT check_compatibility_fnn(%s, %s, %s, %s) AS verdict"
+
+
+def prepared_statements():
+    """The fixed statement set, each with harmless params for warming it up."""
+    statements = [(CHECK_COMPATIBILITY_SQL, ("cpu", 0, "motherboard", 0))]
+    for table_name in FETCHABLE_TABLES:
+        pk_column = "build_id" if table_name == "builds" else "id"
+        statements.append((FETCH_COUNT_SQL.format(table=table_name), ()))
+        statements.append((FETCH_PAGE_SQL.format(table=table_name), (0, 0)))
+        statements.append((FETCH_ITEM_SQL.format(table=table_name, pk=pk_column), (0,)))
+    return statements
+
+
+PREPARED_STATEMENTS = {query for query, _ in prepared_statements()}
+
+class BuildAPCPool(pooling.MySQLConnectionPool):
+    """
+    Pool that rolls back every connection as it is released. Sessions are not
+    reset between requests, so without this a transaction left open (e.g. by
+    update_build when a trigger SIGNALs after its START TRANSACTION) would
+    carry its snapshot and locks into the next request on that connection.
+    """
+
+    def add_connection(self, cnx=None):
+        if cnx is not None:
+            try:
+                cnx.rollback()
+                cnx.last_connection_id = cnx.connection_id
+            except Error:
+                # Drop the session; get_connection reconnects it on next checkout
+                prepared_cursors.pop(cnx.last_connection_id, None)
+                cnx.disconnect()
+        super().add_connection(cnx)
+
+    def get_connection(self):
+        connection = super().get_connection()
+        # A connection that dropped while idle comes back reconnected under a
+        # new id; the prepared cursors of its old session are gone with it
+        last_id = getattr(connection, "last_connection_id", None)
+        if last_id is not None and last_id != connection.connection_id:
+            prepared_cursors.pop(last_id, None)
+        return connection
+
+
+class DatabaseBusy(Exception):
+    """Every pooled connection is checked out; answered with a 503 like admission control."""
+
+
+@app.exception_handler(DatabaseBusy)
+async def database_busy_handler(request: Request, exc: DatabaseBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": "1"}
+    )
+
+
+db_pool = None
+
 def get_connection():
+    if db_pool is not None:
+        try:
+            return db_pool.get_connection()
+        except pooling.PoolError:
+            raise DatabaseBusy()
+    # Until warmup has finished and published the pool
     return mysql.connector.connect(
         host=DB_HOST,
         user=DB_USER,
         password=DB_PASSWORD,
-        database=DB_NAME
+        database=DB_NAME,
+        autocommit=True
     )
 
+
+def release_connection(connection, cursor=None):
+    """
+    Close `cursor` and hand `connection` back. A pooled connection is always
+    returned, even if its session dropped mid-request, or the pool would lose
+    that slot for good; the pool reconnects it on the next checkout.
+    """
+    if connection is None:
+        return
+    if cursor and connection.is_connected():
+        cursor.close()
+    if isinstance(connection, pooling.PooledMySQLConnection) or connection.is_connected():
+        connection.close()
+
+
+# Binary-protocol prepared cursors kept open per pooled connection:
+# {connection_id: {query: cursor}}
+prepared_cursors = {}
+
+
+def execute_prepared(connection, query, params=()):
+    """
+    Execute one of the fixed statements from prepared_statements() as a
+    binary-protocol prepared statement and return its rows as dicts.
+    On a pooled connection the statement is prepared once and its cursor kept
+    for later requests; dynamic SQL belongs on a plain cursor.execute instead.
+    """
+    if query not in PREPARED_STATEMENTS:
+        raise ValueError("Not a fixed prepared statement")
+    if not isinstance(connection, pooling.PooledMySQLConnection):
+        # Direct connection (before warmup): nothing outlives the request
+        cursor = connection.cursor(prepared=True)
+        try:
+            cursor.execute(query, params)
+            return [dict(zip(cursor.column_names, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    cursors = prepared_cursors.setdefault(connection.connection_id, {})
+    cursor = cursors.get(query)
+    if cursor is None:
+        cursor = cursors[query] = connection.cursor(prepared=True)
+    cursor.execute(query, params)
+    return [dict(zip(cursor.column_names, row)) for row in cursor.fetchall()]
+
+# ========== STARTUP WARMUP & READINESS ==========
+
+# Part tables whose data pages are pulled into the InnoDB buffer pool at startup
+WARMUP_TABLE_QUERIES = [
+    "SELECT SUM(price) FROM cpus",
+    "SELECT SUM(price) FROM gpus",
+    "SELECT SUM(price) FROM motherboards",
+    "SELECT SUM(price) FROM ram",
+    "SELECT SUM(price) FROM psus",
+    "SELECT SUM(price) FROM cases",
+    "SELECT SUM(price) FROM ssds",
+    "SELECT SUM(price) FROM displays",
+    "SELECT SUM(total_power_estimate) FROM builds",
+    "SELECT SUM(total_price) FROM build_summaries",
+]
+
+# Cheap calls (no matching rows) that load the key stored routines into each
+# session's routine cache
+WARMUP_FUNCTION_QUERIES = [
+    "SELECT check_compatibility_fnn('cpu', 0, 'motherboard', 0)",
+    "SELECT check_compatibility_fnn('gpu', 0, 'psu', 0)",
+    "SELECT check_compatibility_fnn('motherboard', 0, 'case', 0)",
+]
+WARMUP_PROCEDURE_CALLS = [
+    ("get_build_summary", [0]),
+    ("get_compatible_psus", [0, 0]),
+]
+
+WARMUP_RETRY_SECONDS = 5
+
+warmup_status = {"ready": False, "started_at": None, "finished_at": None, "connections_warmed": 0, "last_error": None}
+
+
+def warm_up_connection(connection):
+    for query, params in prepared_statements():
+        execute_prepared(connection, query, params)
+    cursor = connection.cursor()
+    try:
+        for query in WARMUP_FUNCTION_QUERIES:
+            cursor.execute(query)
+            cursor.fetchall()
+        for procedure, args in WARMUP_PROCEDURE_CALLS:
+            cursor.callproc(procedure, args)
+            for result in cursor.stored_results():
+                result.fetchall()
+    finally:
+        cursor.close()
+
+
+def warm_up():
+    """
+    Create the connection pool, then on every pooled connection prepare the
+    common statements and touch the key routines; touch the part tables once.
+    Retries until the database is reachable. /ready reports ready afterwards.
+
+    The pool is only published to get_connection once warmup is done, since
+    warmup holds every pooled connection; until then requests use direct
+    connections.
+    """
+    global db_pool
+    warmup_status["started_at"] = time.time()
+    pool = None
+    while True:
+        connections = []
+        try:
+            if pool is None:
+                pool = BuildAPCPool(
+                    pool_name="build_a_pc",
+                    pool_size=DB_POOL_SIZE,
+                    # Keep sessions (and their prepared statements) across requests;
+                    # autocommit, plus a rollback on release, so no transaction
+                    # or snapshot outlives a request
+                    pool_reset_session=False,
+                    autocommit=True,
+                    host=DB_HOST,
+                    user=DB_USER,
+                    password=DB_PASSWORD,
+                    database=DB_NAME
+                )
+            # Hold every pooled connection at once so each one gets warmed
+            for _ in range(DB_POOL_SIZE):
+                connections.append(pool.get_connection())
+
+            cursor = connections[0].cursor()
+            for query in WARMUP_TABLE_QUERIES:
+                cursor.execute(query)
+                cursor.fetchall()
+            cursor.close()
+
+            for connection in connections:
+                warm_up_connection(connection)
+                warmup_status["connections_warmed"] += 1
+            break
+        except Error as e:
+            warmup_status["last_error"] = str(e)
+            warmup_status["connections_warmed"] = 0
+            time.sleep(WARMUP_RETRY_SECONDS)
+        finally:
+            for connection in connections:
+                connection.close()
+
+    db_pool = pool
+    warmup_status["finished_at"] = time.time()
+    warmup_status["ready"] = True
+    try:
+        resume_jobs()
+    except (Error, DatabaseBusy):
+        # The job workers retry it every JOB_RECOVERY_INTERVAL
+        pass
+
+
+@app.on_event("startup")
+def start_warmup():
+    # Run in the background so the server starts answering /ready right away
+    threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+    start_job_workers()
+
+
+@app.get("/ready")
+def readiness():
+    """Readiness probe: 503 until the startup warmup has finished."""
+    if not warmup_status["ready"]:
+        return JSONResponse(status_code=503, content=warmup_status)
+    return warmup_status
+
+
 @app.post("/auth/login")
 def auth_login(credentials: dict = Body(...)):
     """Simple login: try to connect with provided MySQL credentials, return role."""
@@ -126,10 +590,7 @@ def user_signup(payload: dict = Body(...)):
             raise HTTPException(status_code=400, detail="Username already exists")
         raise HTTPException(status_code=400, detail=error_msg)
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 
 @app.post("/users/create")
@@ -171,48 +632,126 @@ def create_normal_user_endpoint(payload: dict = Body(...)):
     except Error as e:
         raise HTTPException(status_code=400, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 @app.get("/compatibility/{comp1}/{id1}/{comp2}/{id2}")
 def check_compatibility(comp1: str, id1: int, comp2: str, id2: int):
     connection = None
-    cursor = None
     try:
         connection = get_connection()
-        cursor = connection.cursor()
-        cursor.execute("SELECT check_compatibility_fnn(%s, %s, %s, %s);", (comp1, id1, comp2, id2))
-        result = cursor.fetchone()
-        return {"compatibility": result[0]}
+        result = execute_prepared(connection, CHECK_COMPATIBILITY_SQL, (comp1, id1, comp2, id2))[0]
+        return {"compatibility": result["verdict"]}
     except Error as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection)
             
-@app.get("/builds/details/all")
-def get_build_details():
+def encode_build_cursor(sort_value, build_id):
+    """Opaque keyset cursor: the sort value and build_id of the last row on a page."""
+    raw = json.dumps([str(sort_value), build_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_build_cursor(cursor, sort_by):
+    try:
+        sort_value, build_id = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        build_id = int(build_id)
+        if sort_by != "created_at":
+            sort_value = Decimal(sort_value)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return sort_value, build_id
+
+
+@app.get("/builds")
+def list_builds(
+    sort_by: str = "created_at",
+    order: str = "desc",
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    part_category: Optional[str] = None,
+    part_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None
+):
+    """
+    Paginated builds listing backed by the build_summaries table.
+
+    Uses keyset pagination on (sort column, build_id) so every page is an index
+    range scan of `limit` rows, no matter how many builds exist. With a part
+    filter the scan runs on build_part_sort, which has one
+    (category, part_id, sort column) index per sort column. A price range is
+    only range-scanned when sorting by total_price; with another sort it is
+    applied as a filter, so sparse ranges read more rows per page. Pass the
+    returned next_cursor back as `cursor` to get the following page.
+    """
+    if sort_by not in BUILD_SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of {', '.join(BUILD_SORT_COLUMNS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+    if limit < 1 or limit > MAX_BUILDS_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_BUILDS_PAGE_SIZE}")
+    if (part_category is None) != (part_id is None):
+        raise HTTPException(status_code=400, detail="part_category and part_id must be given together")
+    if part_category is not None and part_category not in BUILD_PART_COLUMNS:
+        raise HTTPException(status_code=400, detail="Invalid part category")
+
+    # Filter, sort and page on `k`: build_part_sort for a part filter, else the summaries
+    conditions = []
+    params = []
+    if part_category is not None:
+        select_from = "SELECT s.* FROM build_part_sort k JOIN build_summaries s ON s.build_id = k.build_id"
+        conditions.append("k.category = %s AND k.part_id = %s")
+        params.extend([part_category, part_id])
+    else:
+        select_from = "SELECT * FROM build_summaries k"
+    if min_price is not None:
+        conditions.append("k.total_price >= %s")
+        params.append(min_price)
+    if max_price is not None:
+        conditions.append("k.total_price <= %s")
+        params.append(max_price)
+    if cursor:
+        sort_value, last_build_id = decode_build_cursor(cursor, sort_by)
+        op = "<" if order == "desc" else ">"
+        conditions.append(f"(k.{sort_by} {op} %s OR (k.{sort_by} = %s AND k.build_id {op} %s))")
+        params.extend([sort_value, sort_value, last_build_id])
+
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    direction = order.upper()
+
     connection = None
-    cursor = None
+    cur = None
     try:
         connection = get_connection()
-        cursor = connection.cursor(dictionary=True)
-        cursor.callproc("get_build_details")
-        data = []
-        for result in cursor.stored_results():
-            data = result.fetchall()
-        return {"builds": data}
+        cur = connection.cursor(dictionary=True)
+        # Fetch one extra row to know whether another page exists
+        cur.execute(
+            f"{select_from} {where_clause} "
+            f"ORDER BY k.{sort_by} {direction}, k.build_id {direction} LIMIT %s",
+            params + [limit + 1]
+        )
+        rows = cur.fetchall()
+
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = None
+        if has_next:
+            last = rows[-1]
+            next_cursor = encode_build_cursor(last[sort_by], last["build_id"])
+
+        return {
+            "builds": rows,
+            "sort_by": sort_by,
+            "order": order,
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "has_next": has_next
+        }
     except Error as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cur)
 
 @app.get("/builds/{build_id}")
 def get_build_summary(build_id: int):
@@ -229,37 +768,26 @@ def get_build_summary(build_id: int):
     except Error as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 
 @app.get("/fetch/{table_name}") #basic select * api end point with pagination support
 def fetch_table(table_name: str, page: int = 1, limit: int = 100):
-    allowed_tables = [
-        "cpus", "gpus", "motherboards", "ram",
-        "psus", "cases", "ssds", "displays", "builds"
-    ]
-    if table_name not in allowed_tables:
+    if table_name not in FETCHABLE_TABLES:
         raise HTTPException(status_code=400, detail="Invalid table name")
 
     connection = None
-    cursor = None
     try:
         connection = get_connection()
-        cursor = connection.cursor(dictionary=True)
         
         # Calculate offset
         offset = (page - 1) * limit
         
         # Get total count
-        cursor.execute(f"SELECT COUNT(*) as total FROM {table_name}")
-        total_count = cursor.fetchone()["total"]
+        total_count = execute_prepared(connection, FETCH_COUNT_SQL.format(table=table_name))[0]["total"]
         
         # Get paginated records
-        cursor.execute(f"SELECT * FROM {table_name} LIMIT %s OFFSET %s", (limit, offset))
-        records = cursor.fetchall()
+        records = execute_prepared(connection, FETCH_PAGE_SQL.format(table=table_name), (limit, offset))
         
         total_pages = (total_count + limit - 1) // limit  # Ceiling division
         
@@ -276,35 +804,25 @@ def fetch_table(table_name: str, page: int = 1, limit: int = 100):
     except Error as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection)
 
 
 @app.get("/fetch/{table_name}/{item_id}")
 def fetch_single_item(table_name: str, item_id: int):
     """Fetch a single item by ID from any table"""
-    allowed_tables = [
-        "cpus", "gpus", "motherboards", "ram",
-        "psus", "cases", "ssds", "displays", "builds"
-    ]
-    if table_name not in allowed_tables:
+    if table_name not in FETCHABLE_TABLES:
         raise HTTPException(status_code=400, detail="Invalid table name")
     
     connection = None
-    cursor = None
     try:
         connection = get_connection()
-        cursor = connection.cursor(dictionary=True)
         
         # Determine the correct primary key column name
         # Only builds table uses 'build_id', all part tables use 'id'
         pk_column = "build_id" if table_name == "builds" else "id"
         
-        query = f"SELECT * FROM {table_name} WHERE {pk_column} = %s"
-        cursor.execute(query, [item_id])
-        item = cursor.fetchone()
+        rows = execute_prepared(connection, FETCH_ITEM_SQL.format(table=table_name, pk=pk_column), (item_id,))
+        item = rows[0] if rows else None
         
         if not item:
             raise HTTPException(status_code=404, detail=f"Item with {pk_column}={item_id} not found in {table_name}")
@@ -316,10 +834,7 @@ def fetch_single_item(table_name: str, item_id: int):
     except Error as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection)
 @app.post("/builds")
 def create_build(build: BuildCreate):
     connection = None
@@ -349,10 +864,214 @@ def create_build(build: BuildCreate):
     except Error as e:
         raise HTTPException(status_code=400, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
+
+def fetch_parts_by_id(cursor, table_name, columns, ids):
+    """Fetch id plus the given extra columns of every part in `ids` with one query; returns {id: row}."""
+    if not ids:
+        return {}
+    placeholders = ', '.join(['%s'] * len(ids))
+    select_list = f"id, {columns}" if columns else "id"
+    cursor.execute(f"SELECT {select_list} FROM {table_name} WHERE id IN ({placeholders})", list(ids))
+    return {row["id"]: row for row in cursor.fetchall()}
+
+
+def validate_bulk_build(build, parts):
+    """
+    Pre-check one build against the part foreign keys and the rules of the
+    BEFORE INSERT triggers on builds, using part rows already loaded in `parts`.
+    This only rejects obviously bad builds early with readable reasons; the
+    triggers still run on every insert and remain the enforcement.
+    Returns a list of reasons (empty if the build looks valid).
+    """
+    reasons = []
+    selected = {}
+    for table_name, column in BUILD_PART_COLUMNS.items():
+        part_id = getattr(build, column)
+        if part_id is None:
+            continue
+        part = parts[table_name].get(part_id)
+        if part is None:
+            reasons.append(f"Unknown {table_name} id {part_id}")
+        else:
+            selected[table_name] = part
+
+    cpu = selected.get("cpus")
+    gpu = selected.get("gpus")
+    psu = selected.get("psus")
+    power = ((cpu["tdp"] or 0) if cpu else 0) + ((gpu["tdp_w"] or 0) if gpu else 0) + 100
+
+    if gpu and psu:
+        if gpu["tdp_w"] is None or psu["watt"] is None or psu["watt"] < gpu["tdp_w"]:
+            reasons.append("PSU wattage is insufficient for selected GPU")
+    if psu and (psu["watt"] or 0) < power:
+        reasons.append("PSU wattage is insufficient for the estimated power consumption of this build")
+    return reasons
+
+
+def insert_builds(connection, cursor, builds):
+    """
+    Insert `builds` with one multi-row INSERT in its own transaction and return
+    their (build_id, total_power_estimate, total_price) rows in insertion order.
+    Raises Error (after rolling back) if the rows read back don't match one to
+    one with `builds`.
+    """
+    row_placeholder = "(%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+    values = []
+    for build in builds:
+        values.extend([
+            build.build_name,
+            build.cpu_id,
+            build.gpu_id,
+            build.motherboard_id,
+            build.ram_id,
+            build.psu_id,
+            build.case_id,
+            build.ssd_id,
+            build.display_id
+        ])
+    query = f"""
+    INSERT INTO builds
+        (build_name, cpu_id, gpu_id, motherboard_id, ram_id, psu_id, case_id, ssd_id, display_id)
+    VALUES {', '.join([row_placeholder] * len(builds))}
+    """
+    # The snapshot is taken before the INSERT, so the only rows at or above
+    # the first new id it can see are this statement's own, whatever the
+    # auto_increment_increment.
+    connection.start_transaction(consistent_snapshot=True, isolation_level="REPEATABLE READ")
+    try:
+        cursor.execute(query, values)
+        cursor.execute("""
+            SELECT b.build_id, b.total_power_estimate, s.total_price
+            FROM builds b
+            JOIN build_summaries s ON s.build_id = b.build_id
+            WHERE b.build_id >= LAST_INSERT_ID()
+            ORDER BY b.build_id
+        """)
+        rows = cursor.fetchall()
+        if len(rows) != len(builds):
+            # Never report ids we can't match to a build; undo and let the caller retry
+            raise Error(msg=f"Inserted {len(builds)} builds but read back {len(rows)}")
+        connection.commit()
+    except Error:
+        connection.rollback()
+        raise
+    return rows
+
+
+@app.post("/builds/bulk")
+def create_builds_bulk(payload: BulkBuildCreate):
+    """
+    Validate, price and insert many builds at once.
+
+    All referenced parts are loaded with one query per part table and every
+    build is pre-checked in memory so obviously invalid builds are rejected
+    without touching builds. The rest are inserted with multi-row INSERTs, one
+    transaction per chunk, and still go through the insert triggers. If a
+    chunk fails, its builds are retried one at a time so each gets its own
+    reason. Returns an accept/reject result per build.
+    """
+    builds = payload.builds
+    if not builds:
+        raise HTTPException(status_code=400, detail="builds must not be empty")
+    if len(builds) > MAX_BULK_BUILDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_BUILDS} builds per request")
+
+    extra_columns = {"cpus": "tdp", "gpus": "tdp_w", "psus": "watt"}
+
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor(dictionary=True)
+
+        parts = {}
+        for table_name, column in BUILD_PART_COLUMNS.items():
+            ids = {getattr(b, column) for b in builds if getattr(b, column) is not None}
+            parts[table_name] = fetch_parts_by_id(cursor, table_name, extra_columns.get(table_name), ids)
+
+        results = [None] * len(builds)
+        accepted = []
+        for index, build in enumerate(builds):
+            reasons = validate_bulk_build(build, parts)
+            if reasons:
+                results[index] = {"index": index, "build_name": build.build_name, "status": "rejected", "reasons": reasons}
+            else:
+                accepted.append((index, build))
+
+        def accept(index, build, row):
+            results[index] = {
+                "index": index,
+                "build_name": build.build_name,
+                "status": "accepted",
+                "build_id": row["build_id"],
+                "total_price": row["total_price"],
+                "total_power_estimate": row["total_power_estimate"]
+            }
+
+        for start in range(0, len(accepted), BULK_INSERT_CHUNK_SIZE):
+            chunk = accepted[start:start + BULK_INSERT_CHUNK_SIZE]
+            try:
+                rows = insert_builds(connection, cursor, [build for _, build in chunk])
+            except Error:
+                # A trigger or foreign key rejected some row: find out which
+                for index, build in chunk:
+                    try:
+                        row = insert_builds(connection, cursor, [build])[0]
+                    except Error as e:
+                        results[index] = {"index": index, "build_name": build.build_name, "status": "rejected", "reasons": [str(e)]}
+                    else:
+                        accept(index, build, row)
+                continue
+            for (index, build), row in zip(chunk, rows):
+                accept(index, build, row)
+
+        accepted_count = sum(1 for r in results if r["status"] == "accepted")
+        return {
+            "accepted": accepted_count,
+            "rejected": len(results) - accepted_count,
+            "results": results
+        }
+    except Error as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        release_connection(connection, cursor)
+
+# Popularity category -> (id column, name column) in build_summaries
+BUILD_POPULARITY_COLUMNS = {
+    "cpu": ("cpu_id", "cpu"),
+    "gpu": ("gpu_id", "gpu"),
+    "motherboard": ("motherboard_id", "motherboard"),
+    "ram": ("ram_id", "ram"),
+    "psu": ("psu_id", "psu"),
+    "case": ("case_id", "case_name"),
+    "ssd": ("ssd_id", "ssd_name"),
+    "display": ("display_id", "display_name"),
+}
+
+
+@app.get("/builds/analytics/popularity")
+def get_part_popularity():
+    """How many saved builds use each part, per category, most popular first."""
+    query = " UNION ALL ".join(
+        f"(SELECT '{category}' AS category, ANY_VALUE({name_column}) AS name, COUNT(*) AS count "
+        f"FROM build_summaries WHERE {id_column} IS NOT NULL GROUP BY {id_column})"
+        for category, (id_column, name_column) in BUILD_POPULARITY_COLUMNS.items()
+    )
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(query + " ORDER BY category, count DESC")
+        popularity = {category: [] for category in BUILD_POPULARITY_COLUMNS}
+        for row in cursor.fetchall():
+            popularity[row["category"]].append({"name": row["name"], "count": row["count"]})
+        return {"popularity": popularity}
+    except Error as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        release_connection(connection, cursor)
 
 @app.get("/builds/analytics/high-power")
 def get_high_power_builds():
@@ -369,10 +1088,7 @@ def get_high_power_builds():
     except Error as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 @app.get("/parts/counts")
 def get_part_counts():
@@ -396,10 +1112,7 @@ def get_part_counts():
     except Error as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 @app.get("/power/{build_id}")
 def estimate_build_power(build_id: int):
@@ -438,10 +1151,7 @@ def estimate_build_power(build_id: int):
     except Error as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 @app.get("/compare/{category}/{ids}")
 def compare_parts(category: str, ids: str):
@@ -458,10 +1168,7 @@ def compare_parts(category: str, ids: str):
     except Error as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 @app.get("/search/{category}")
 def search_parts(category: str, keyword: str = "", min_price: float = 0, max_price: float = 999999):
@@ -478,10 +1185,7 @@ def search_parts(category: str, keyword: str = "", min_price: float = 0, max_pri
     except Error as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 @app.get("/find/{search_term}")
 def find_component_by_name(search_term: str):
@@ -498,10 +1202,7 @@ def find_component_by_name(search_term: str):
     except Error as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 
 
@@ -534,10 +1235,7 @@ def update_build(build_id: int, build_update: BuildUpdate):
     except Error as e:
         raise HTTPException(status_code=400, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 @app.delete("/builds/{build_id}")
 def delete_build(build_id: int):
@@ -557,10 +1255,7 @@ def delete_build(build_id: int):
     except Error as e:
         raise HTTPException(status_code=400, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 # ========== ADMIN CRUD ENDPOINTS ==========
 
@@ -593,10 +1288,7 @@ def admin_create_item(table_name: str, item: dict = Body(...)):
     except Error as e:
         raise HTTPException(status_code=400, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 
 @app.put("/admin/{table_name}/{item_id}")
@@ -634,10 +1326,7 @@ def admin_update_item(table_name: str, item_id: int, item: dict = Body(...)):
     except Error as e:
         raise HTTPException(status_code=400, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 
 @app.delete("/admin/{table_name}/{item_id}")
@@ -668,10 +1357,7 @@ def admin_delete_item(table_name: str, item_id: int):
     except Error as e:
         raise HTTPException(status_code=400, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 @app.post("/parts/compatible/{category}")
 def get_compatible_parts(category: str, build_state: BuildState = Body(...)):
@@ -714,10 +1400,7 @@ def get_compatible_parts(category: str, build_state: BuildState = Body(...)):
     except Error as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 
 @app.patch("/admin/{table_name}/{item_id}/{column}")
@@ -766,10 +1449,7 @@ def admin_update_attribute(table_name: str, item_id: int, column: str, payload:
             raise HTTPException(status_code=400, detail=f"Column '{column}' does not exist in table '{table_name}'")
         raise HTTPException(status_code=400, detail=error_msg)
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
 
 @app.post("/psus/compatibility")
 def get_compatible_psus_endpoint(
@@ -792,8 +1472,639 @@ def get_compatible_psus_endpoint(
     except Error as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if connection and connection.is_connected():
-            if cursor:
-                cursor.close()
-            connection.close()
+        release_connection(connection, cursor)
+
+# ========== BUILDER SESSION (WEBSOCKET) ==========
+
+def compute_builder_state(build_state, categories, checks):
+    """Run get_compatible_parts for `categories` and check_compatibility_fnn for `checks` on one connection."""
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor(dictionary=True)
+
+        compatible = {}
+        for category in categories:
+            cursor.callproc("get_compatible_parts", [
+                category,
+                build_state.cpu_id,
+                build_state.motherboard_id,
+                build_state.ram_id,
+                build_state.gpu_id,
+                build_state.case_id,
+                build_state.psu_id
+            ])
+            compatible[category] = []
+            for result in cursor.stored_results():
+                compatible[category] = result.fetchall()
+
+        verdicts = {}
+        for check in checks:
+            (comp1, slot1), (comp2, slot2) = BUILDER_CHECKS[check]
+            id1 = getattr(build_state, slot1)
+            id2 = getattr(build_state, slot2)
+            if id1 is None or id2 is None:
+                verdicts[check] = None
+                continue
+            verdicts[check] = execute_prepared(connection, CHECK_COMPATIBILITY_SQL, (comp1, id1, comp2, id2))[0]["verdict"]
+
+        return compatible, verdicts
+    finally:
+        release_connection(connection, cursor)
+
+
+class BuilderSession:
+    """
+    Server-side build state for one /ws/builder connection: the selected parts,
+    the compatible-part ids last sent for each subscribed category, and the
+    last check verdicts. Used to work out what a change invalidates and to
+    send only the differences.
+    """
+
+    def __init__(self):
+        self.build = BuildState()
+        # None until a subscribed category's first list has been sent
+        self.compatible_ids = {}
+        self.verdicts = {}
+        # Work left over from a rejected or failed recompute, retried on the next message
+        self.pending_categories = set()
+        self.pending_checks = set()
+
+    def subscribe(self, categories):
+        new_categories = [c for c in categories if c not in self.compatible_ids]
+        for category in new_categories:
+            self.compatible_ids[category] = None
+        return new_categories
+
+    def unsubscribe(self, categories):
+        for category in categories:
+            self.compatible_ids.pop(category, None)
+
+    def set_parts(self, parts):
+        """Apply {slot: part_id or None}; returns the set of slots that actually changed."""
+        changed = set()
+        for slot, part_id in parts.items():
+            if getattr(self.build, slot) != part_id:
+                setattr(self.build, slot, part_id)
+                changed.add(slot)
+        return changed
+
+    def affected_by(self, changed_slots):
+        categories = [
+            c for c in self.compatible_ids
+            if changed_slots.intersection(COMPATIBLE_PART_DEPENDENCIES[c])
+        ]
+        checks = [
+            check for check, ((_, slot1), (_, slot2)) in BUILDER_CHECKS.items()
+            if slot1 in changed_slots or slot2 in changed_slots
+        ]
+        return categories, checks
+
+    def diff(self, compatible, verdicts):
+        compatible_diff = {}
+        for category, rows in compatible.items():
+            previous = self.compatible_ids.get(category)
+            current = {row["id"] for row in rows}
+            if previous is None:
+                # First list since subscribing: replaces whatever the client holds
+                compatible_diff[category] = {"full": True, "added": rows, "removed": []}
+            else:
+                compatible_diff[category] = {
+                    "added": [row for row in rows if row["id"] not in previous],
+                    "removed": sorted(previous - current),
+                }
+            self.compatible_ids[category] = current
+
+        checks_diff = {}
+        for check, verdict in verdicts.items():
+            if self.verdicts.get(check) != verdict:
+                checks_diff[check] = verdict
+                self.verdicts[check] = verdict
+
+        return {"type": "update", "compatible": compatible_diff, "checks": checks_diff}
+
 
+@app.websocket("/ws/builder")
+async def builder_session(websocket: WebSocket):
+    """
+    Stateful builder session. Client messages:
+      {"action": "subscribe", "categories": ["cpus", ...]}    # choosers to keep up to date
+      {"action": "unsubscribe", "categories": [...]}
+      {"action": "set", "parts": {"case_id": 12, "gpu_id": null}}
+    After each message the server recomputes only the categories and checks
+    that depend on what changed and replies with
+      {"type": "update", "compatible": {category: {"added": [rows], "removed": [ids]}}, "checks": {key: verdict}}
+    where the first list after subscribing carries "full": true and replaces
+    the client's copy. Errors are {"type": "error", "detail": ...}; those for a
+    failed recompute also list the pending "categories", plus "retry_after"
+    when the request was only throttled.
+    """
+    await websocket.accept()
+    session = BuilderSession()
+    client = websocket.client.host if websocket.client else "unknown"
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except (KeyError, ValueError):
+                # KeyError: a binary frame; ValueError: malformed JSON
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON text"})
+                continue
+            if not isinstance(message, dict):
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON objects"})
+                continue
+            action = message.get("action")
+
+            if action in ("subscribe", "unsubscribe"):
+                categories = message.get("categories", [])
+                if not isinstance(categories, list) or not all(isinstance(c, str) for c in categories):
+                    await websocket.send_json({"type": "error", "detail": "categories must be a list of table names"})
+                    continue
+                invalid = [c for c in categories if c not in COMPATIBLE_PART_DEPENDENCIES]
+                if invalid:
+                    await websocket.send_json({"type": "error", "detail": f"Invalid categories: {', '.join(invalid)}"})
+                    continue
+                if action == "unsubscribe":
+                    session.unsubscribe(categories)
+                    continue
+                categories, checks = session.subscribe(categories), []
+            elif action == "set":
+                parts = message.get("parts", {})
+                if not isinstance(parts, dict):
+                    await websocket.send_json({"type": "error", "detail": "parts must map build slots to part ids or null"})
+                    continue
+                invalid = [slot for slot in parts if slot not in COMPATIBLE_PART_SLOTS]
+                if invalid or not all(v is None or isinstance(v, int) for v in parts.values()):
+                    await websocket.send_json({"type": "error", "detail": "parts must map build slots to part ids or null"})
+                    continue
+                categories, checks = session.affected_by(session.set_parts(parts))
+            else:
+                await websocket.send_json({"type": "error", "detail": "Unknown action"})
+                continue
+
+            categories = [c for c in session.pending_categories.union(categories) if c in session.compatible_ids]
+            checks = list(session.pending_checks.union(checks))
+            session.pending_categories, session.pending_checks = set(categories), set(checks)
+
+            verdicts = {}
+            compatible = {}
+            if categories or checks:
+                rejection = admission.admit(client, "builder")
+                if rejection:
+                    status_code, detail, retry_after = rejection
+                    await websocket.send_json({"type": "error", "status": status_code, "detail": detail,
+                                               "retry_after": retry_after, "categories": categories})
+                    continue
+                try:
+                    compatible, verdicts = await run_in_threadpool(compute_builder_state, session.build, categories, checks)
+                except DatabaseBusy:
+                    await websocket.send_json({"type": "error", "status": 503, "detail": "Server busy, please retry",
+                                               "retry_after": 1, "categories": categories})
+                    continue
+                except Error as e:
+                    await websocket.send_json({"type": "error", "detail": str(e), "categories": categories})
+                    continue
+                finally:
+                    admission.release("builder")
+            session.pending_categories.clear()
+            session.pending_checks.clear()
+
+            await websocket.send_json(jsonable_encoder(session.diff(compatible, verdicts)))
+    except WebSocketDisconnect:
+        pass
+
+# ========== BACKGROUND JOBS ==========
+
+# Rows per chunk; each chunk is one short unit of work on one pooled connection
+JOB_CHUNK_SIZE = 500
+MAX_JOB_CHUNK_SIZE = 5000
+
+# Back off while interactive traffic holds this many DB slots, but never wait
+# longer than JOB_MAX_THROTTLE_WAIT before running a chunk anyway
+JOB_THROTTLE_IN_FLIGHT = MAX_CONCURRENT_DB_REQUESTS // 2
+JOB_THROTTLE_SLEEP = 0.5
+JOB_MAX_THROTTLE_WAIT = 10
+JOB_CHUNK_PAUSE = 0.05
+
+# A 'running' job with no progress for this long was interrupted and may be resumed
+JOB_STALE_SECONDS = 60
+
+# How often the workers look for queued or stale jobs that were never (re)queued,
+# e.g. because the DB was unreachable when claiming or failing them
+JOB_RECOVERY_INTERVAL = JOB_STALE_SECONDS
+
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports")
+EXPORT_TABLES = ["cpus", "gpus", "motherboards", "ram", "psus", "cases", "ssds", "displays"]
+
+job_queue = queue.Queue()
+job_workers = []
+job_recovery = {"last": 0.0}
+job_recovery_lock = threading.Lock()
+
+
+class JobCreate(BaseModel):
+    job_type: str
+    params: dict = {}
+
+
+def init_build_scan(cursor, job):
+    # Bound the scan to the builds that exist now, so the total stays fixed
+    cursor.execute("SELECT COUNT(*) AS total, COALESCE(MAX(build_id), 0) AS max_id FROM builds")
+    row = cursor.fetchone()
+    return row["total"], {"last_id": 0, "max_id": row["max_id"]}
+
+
+def next_build_ids(cursor, state, chunk_size):
+    cursor.execute(
+        "SELECT build_id FROM builds WHERE build_id > %s AND build_id <= %s ORDER BY build_id LIMIT %s",
+        (state["last_id"], state["max_id"], chunk_size)
+    )
+    return [row["build_id"] for row in cursor.fetchall()]
+
+
+def run_recompute_power_chunk(cursor, job, state, chunk_size):
+    """Recompute total_power_estimate (same formula as estimate_power) for the next chunk of builds."""
+    build_ids = next_build_ids(cursor, state, chunk_size)
+    if not build_ids:
+        return 0, True
+    try:
+        cursor.execute("""
+            UPDATE builds b
+            LEFT JOIN cpus c ON b.cpu_id = c.id
+            LEFT JOIN gpus g ON b.gpu_id = g.id
+            SET b.total_power_estimate = COALESCE(c.tdp, 0) + COALESCE(g.tdp_w, 0) + 100
+            WHERE b.build_id BETWEEN %s AND %s
+        """, (build_ids[0], build_ids[-1]))
+    except Error:
+        # check_psu_sufficient_before_update rejects the whole statement if any
+        # build's PSU no longer covers its parts; retry one build at a time
+        for build_id in build_ids:
+            try:
+                cursor.callproc("estimate_power", [build_id])
+            except Error as e:
+                state["failed"] = state.get("failed", 0) + 1
+                failures = state.setdefault("failures", [])
+                if len(failures) < 100:
+                    failures.append({"build_id": build_id, "error": str(e)})
+    state["last_id"] = build_ids[-1]
+    return len(build_ids), False
+
+
+def run_audit_compatibility_chunk(cursor, job, state, chunk_size):
+    """Run check_compatibility_fnn over the next chunk of builds and record every incompatibility."""
+    build_ids = next_build_ids(cursor, state, chunk_size)
+    if not build_ids:
+        return 0, True
+    cursor.execute("""
+        SELECT build_id,
+            CASE WHEN cpu_id IS NOT NULL AND motherboard_id IS NOT NULL
+                THEN check_compatibility_fnn('cpu', cpu_id, 'motherboard', motherboard_id) END AS cpu_mb,
+            CASE WHEN motherboard_id IS NOT NULL AND case_id IS NOT NULL
+                THEN check_compatibility_fnn('motherboard', motherboard_id, 'case', case_id) END AS mb_case,
+            CASE WHEN gpu_id IS NOT NULL AND psu_id IS NOT NULL
+                THEN check_compatibility_fnn('gpu', gpu_id, 'psu', psu_id) END AS gpu_psu
+        FROM builds
+        WHERE build_id BETWEEN %s AND %s
+    """, (build_ids[0], build_ids[-1]))
+    issues = []
+    for row in cursor.fetchall():
+        for check in BUILDER_CHECKS:
+            verdict = row[check]
+            if verdict is not None and not verdict.startswith("Compatible"):
+                issues.append((job["job_id"], row["build_id"], check, verdict))
+    if issues:
+        # REPLACE keeps a re-run chunk (after an interruption) from duplicating rows
+        cursor.executemany(
+            "REPLACE INTO job_results (job_id, build_id, check_name, verdict) VALUES (%s, %s, %s, %s)",
+            issues
+        )
+    state["issues"] = state.get("issues", 0) + len(issues)
+    state["last_id"] = build_ids[-1]
+    return len(build_ids), False
+
+
+def init_catalog_export(cursor, job):
+    total = 0
+    for table_name in EXPORT_TABLES:
+        cursor.execute(f"SELECT COUNT(*) AS total FROM {table_name}")
+        total += cursor.fetchone()["total"]
+    directory = os.path.join(EXPORT_DIR, f"job_{job['job_id']}")
+    os.makedirs(directory, exist_ok=True)
+    return total, {"directory": directory, "table_index": 0, "last_id": 0, "file_offset": 0}
+
+
+def run_catalog_export_chunk(cursor, job, state, chunk_size):
+    """Append the next chunk of the current part table to its CSV file in the export directory."""
+    if state["table_index"] >= len(EXPORT_TABLES):
+        return 0, True
+    table_name = EXPORT_TABLES[state["table_index"]]
+    cursor.execute(f"SELECT * FROM {table_name} WHERE id > %s ORDER BY id LIMIT %s", (state["last_id"], chunk_size))
+    rows = cursor.fetchall()
+    if not rows:
+        state.update({"table_index": state["table_index"] + 1, "last_id": 0, "file_offset": 0})
+        return 0, state["table_index"] >= len(EXPORT_TABLES)
+
+    path = os.path.join(state["directory"], f"{table_name}.csv")
+    with open(path, "a+", newline="", encoding="utf-8") as f:
+        # Drop anything written after the last recorded chunk (interrupted run)
+        f.truncate(state["file_offset"])
+        f.seek(state["file_offset"])
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        if state["file_offset"] == 0:
+            writer.writeheader()
+        writer.writerows(rows)
+        state["file_offset"] = f.tell()
+    state["last_id"] = rows[-1]["id"]
+    return len(rows), False
+
+
+# job_type -> (initializer returning (total, state), chunk runner returning (processed, done))
+JOB_TYPES = {
+    "recompute_power": (init_build_scan, run_recompute_power_chunk),
+    "audit_compatibility": (init_build_scan, run_audit_compatibility_chunk),
+    "export_catalog": (init_catalog_export, run_catalog_export_chunk),
+}
+
+
+def load_json(value):
+    return json.loads(value) if value else None
+
+
+def with_job_cursor(fn, *args):
+    """Run fn(cursor, *args) on a pooled connection held only for that call."""
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor(dictionary=True)
+        return fn(cursor, *args)
+    finally:
+        release_connection(connection, cursor)
+
+
+def claim_job(cursor, job_id):
+    cursor.execute("""
+        UPDATE jobs
+        SET status = 'running', started_at = COALESCE(started_at, NOW()), updated_at = NOW()
+        WHERE job_id = %s
+          AND (status = 'queued' OR (status = 'running' AND updated_at < NOW() - INTERVAL %s SECOND))
+    """, (job_id, JOB_STALE_SECONDS))
+    if cursor.rowcount != 1:
+        return None
+    cursor.execute("SELECT * FROM jobs WHERE job_id = %s", (job_id,))
+    return cursor.fetchone()
+
+
+def run_job_step(cursor, job, state, chunk_size):
+    """Run one chunk and persist its progress; returns (status, done)."""
+    cursor.execute("SELECT status FROM jobs WHERE job_id = %s", (job["job_id"],))
+    status = cursor.fetchone()["status"]
+    if status != "running":
+        return status, True
+
+    _, run_chunk = JOB_TYPES[job["job_type"]]
+    started = time.monotonic()
+    processed, done = run_chunk(cursor, job, state, chunk_size)
+    cursor.execute("""
+        UPDATE jobs
+        SET state = %s, processed = processed + %s, active_seconds = active_seconds + %s,
+            status = %s, finished_at = IF(%s, NOW(), NULL), updated_at = NOW()
+        WHERE job_id = %s AND status = 'running'
+    """, (json.dumps(state), processed, time.monotonic() - started,
+          "completed" if done else "running", done, job["job_id"]))
+    if cursor.rowcount == 0:
+        # Cancelled while the chunk ran: leave the cancel in place and stop.
+        # (A no-op update also reports 0 rows, so check before stopping.)
+        cursor.execute("SELECT status FROM jobs WHERE job_id = %s", (job["job_id"],))
+        status = cursor.fetchone()["status"]
+        if status != "running":
+            return status, True
+    return ("completed" if done else "running"), done
+
+
+def heartbeat_job(cursor, job_id):
+    cursor.execute("UPDATE jobs SET updated_at = NOW() WHERE job_id = %s", (job_id,))
+
+
+def run_job(job_id):
+    job = with_job_cursor(claim_job, job_id)
+    if job is None:
+        # Finished, cancelled, or already running elsewhere
+        return
+    try:
+        state = load_json(job["state"])
+        if state is None:
+            init, _ = JOB_TYPES[job["job_type"]]
+
+            def initialize(cursor):
+                total, initial_state = init(cursor, job)
+                cursor.execute("UPDATE jobs SET total = %s, state = %s WHERE job_id = %s",
+                               (total, json.dumps(initial_state), job_id))
+                return initial_state
+
+            state = with_job_cursor(initialize)
+
+        params = load_json(job["params"]) or {}
+        chunk_size = max(1, min(int(params.get("chunk_size", JOB_CHUNK_SIZE)), MAX_JOB_CHUNK_SIZE))
+        while True:
+            # Yield to interactive traffic, but keep making progress
+            waited = 0
+            while admission.in_flight >= JOB_THROTTLE_IN_FLIGHT and waited < JOB_MAX_THROTTLE_WAIT:
+                time.sleep(JOB_THROTTLE_SLEEP)
+                waited += JOB_THROTTLE_SLEEP
+            if waited:
+                with_job_cursor(heartbeat_job, job_id)
+
+            _, done = with_job_cursor(run_job_step, job, state, chunk_size)
+            if done:
+                return
+            time.sleep(JOB_CHUNK_PAUSE)
+    except Exception as e:
+        def mark_failed(cursor):
+            cursor.execute("UPDATE jobs SET status = 'failed', error = %s, finished_at = NOW() WHERE job_id = %s",
+                           (str(e), job_id))
+        try:
+            with_job_cursor(mark_failed)
+        except (Error, DatabaseBusy):
+            # Left 'running'; recover_jobs() resumes it once it goes stale
+            pass
+
+
+def job_worker():
+    while True:
+        try:
+            job_id = job_queue.get(timeout=JOB_RECOVERY_INTERVAL)
+        except queue.Empty:
+            job_id = None
+        if job_id is not None:
+            try:
+                run_job(job_id)
+            except (Error, DatabaseBusy):
+                # DB unavailable while claiming; recover_jobs() requeues it later
+                pass
+            finally:
+                job_queue.task_done()
+        recover_jobs()
+
+
+def start_job_workers():
+    for i in range(JOB_WORKERS):
+        worker = threading.Thread(target=job_worker, name=f"job-worker-{i}", daemon=True)
+        worker.start()
+        job_workers.append(worker)
+
+
+def resume_jobs():
+    """Queue jobs left queued or interrupted (stale 'running') by a previous process."""
+    def find_resumable(cursor):
+        cursor.execute("""
+            SELECT job_id FROM jobs
+            WHERE status = 'queued' OR (status = 'running' AND updated_at < NOW() - INTERVAL %s SECOND)
+            ORDER BY job_id
+        """, (JOB_STALE_SECONDS,))
+        return [row["job_id"] for row in cursor.fetchall()]
+
+    for job_id in with_job_cursor(find_resumable):
+        job_queue.put(job_id)
+    job_recovery["last"] = time.monotonic()
+
+
+def recover_jobs():
+    """Run resume_jobs() at most once per JOB_RECOVERY_INTERVAL across all workers."""
+    with job_recovery_lock:
+        if time.monotonic() - job_recovery["last"] < JOB_RECOVERY_INTERVAL:
+            return
+        job_recovery["last"] = time.monotonic()
+    try:
+        resume_jobs()
+    except (Error, DatabaseBusy):
+        # Still unavailable; try again next interval
+        pass
+
+
+def describe_job(job):
+    """Job row plus throughput (rows/s of active work) and ETA in seconds."""
+    job = dict(job)
+    job["params"] = load_json(job["params"])
+    job["state"] = load_json(job["state"])
+    throughput = job["processed"] / job["active_seconds"] if job["active_seconds"] else None
+    job["throughput"] = throughput
+    job["eta_seconds"] = None
+    if throughput and job["total"] is not None and job["status"] == "running":
+        job["eta_seconds"] = max(0, job["total"] - job["processed"]) / throughput
+    return job
+
+
+@app.post("/jobs", status_code=202)
+def create_job(job: JobCreate):
+    """Queue a background job: recompute_power, audit_compatibility or export_catalog."""
+    if job.job_type not in JOB_TYPES:
+        raise HTTPException(status_code=400, detail=f"job_type must be one of {', '.join(JOB_TYPES)}")
+    chunk_size = job.params.get("chunk_size", JOB_CHUNK_SIZE)
+    if isinstance(chunk_size, bool) or not isinstance(chunk_size, int) or not 1 <= chunk_size <= MAX_JOB_CHUNK_SIZE:
+        raise HTTPException(status_code=400, detail=f"params.chunk_size must be an integer between 1 and {MAX_JOB_CHUNK_SIZE}")
+
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor()
+        cursor.execute("INSERT INTO jobs (job_type, params) VALUES (%s, %s)", (job.job_type, json.dumps(job.params)))
+        connection.commit()
+        job_id = cursor.lastrowid
+        job_queue.put(job_id)
+        return {"job_id": job_id, "status": "queued"}
+    except Error as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        release_connection(connection, cursor)
+
+
+@app.get("/jobs")
+def list_jobs(limit: int = 20):
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM jobs ORDER BY job_id DESC LIMIT %s", (max(1, min(limit, 100)),))
+        return {"jobs": [describe_job(job) for job in cursor.fetchall()]}
+    except Error as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        release_connection(connection, cursor)
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: int):
+    """Progress of a job: status, processed/total, throughput and ETA."""
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM jobs WHERE job_id = %s", (job_id,))
+        job = cursor.fetchone()
+        if not job:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        return describe_job(job)
+    except Error as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        release_connection(connection, cursor)
+
+
+@app.get("/jobs/{job_id}/results")
+def get_job_results(job_id: int, after_build_id: int = 0, after_check_name: str = "", limit: int = 100):
+    """
+    Incompatibilities found by an audit_compatibility job, paginated on
+    (build_id, check_name). Pass the returned after_build_id/after_check_name
+    back to get the next page.
+    """
+    limit = max(1, min(limit, 1000))
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT build_id, check_name, verdict FROM job_results
+            WHERE job_id = %s AND (build_id > %s OR (build_id = %s AND check_name > %s))
+            ORDER BY build_id, check_name
+            LIMIT %s
+        """, (job_id, after_build_id, after_build_id, after_check_name, limit))
+        rows = cursor.fetchall()
+        last = rows[-1] if len(rows) == limit else None
+        return {
+            "job_id": job_id,
+            "results": rows,
+            "after_build_id": last["build_id"] if last else None,
+            "after_check_name": last["check_name"] if last else None
+        }
+    except Error as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        release_connection(connection, cursor)
+
+
+@app.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: int):
+    """Cancel a queued or running job; a running job stops before its next chunk."""
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = connection.cursor()
+        cursor.execute("""
+            UPDATE jobs SET status = 'cancelled', finished_at = NOW()
+            WHERE job_id = %s AND status IN ('queued', 'running')
+        """, (job_id,))
+        connection.commit()
+        if cursor.rowcount == 0:
+            raise HTTPException(status_code=404, detail=f"No queued or running job {job_id}")
+        return {"job_id": job_id, "status": "cancelled"}
+    except Error as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        release_connection(connection, cursor)
@@ -31,8 +31,9 @@ export const fetchSinglePart = (category, id) => {
   return api.get(`/fetch/${category}/${id}`);
 };
 
-export const getAllBuildDetails = () => {
-  return api.get('/builds/details/all');
+// Paginated builds listing; params: sort_by, order, limit, cursor, part_category, part_id, min_price, max_price
+export const listBuilds = (params = {}) => {
+  return api.get('/builds', { params });
 };
 
 export const getBuildWithPrices = (buildId) => {
@@ -48,6 +49,11 @@ export const createBuild = (buildData) => {
   return api.post('/builds', buildData);
 };
 
+// builds: array of BuildCreate objects; returns per-build accept/reject results
+export const createBuildsBulk = (builds) => {
+  return api.post('/builds/bulk', { builds });
+};
+
 export const updateBuild = (buildId, buildUpdateData) => {
   // buildUpdateData should match your BuildUpdate Pydantic model
   return api.put(`/builds/${buildId}`, buildUpdateData);
@@ -73,6 +79,14 @@ export const getCompatibleParts = (category, buildState) => {
   return api.post(`/parts/compatible/${category}`, buildState);
 };
 
+// Stateful builder session: send {action: 'subscribe' | 'unsubscribe' | 'set', ...},
+// receive {type: 'update', compatible: {table: {added, removed}}, checks: {key: verdict}}
+export const openBuilderSession = (onMessage) => {
+  const socket = new WebSocket(`${API_URL.replace(/^http/, 'ws')}/ws/builder`);
+  socket.onmessage = (event) => onMessage(JSON.parse(event.data));
+  return socket;
+};
+
 // === Admin Endpoints ===
 export const getCompatiblePSUs = (gpuId, caseId) => {
   return api.post(`/psus/compatibility?gpu_id=${gpuId}&case_id=${caseId}`);
@@ -102,6 +116,20 @@ export const getHighPowerBuilds = () => {
   return api.get('/builds/analytics/high-power');
 };
 
+// Per category: [{ name, count }] of parts used by saved builds, most popular first
+export const getPartPopularity = () => {
+  return api.get('/builds/analytics/popularity');
+};
+
+// Background jobs: jobType is recompute_power, audit_compatibility or export_catalog
+export const createJob = (jobType, params = {}) => {
+  return api.post('/jobs', { job_type: jobType, params });
+};
+
+export const getJob = (jobId) => {
+  return api.get(`/jobs/${jobId}`);
+};
+
 // Export default for easy import
 const apiService = {
   loginUser,
@@ -109,9 +137,10 @@ const apiService = {
   fetchParts,
   fetchTable,
   fetchSinglePart,
-  getAllBuildDetails,
+  listBuilds,
   getBuildSummary,
   createBuild,
+  createBuildsBulk,
   updateBuild,
   deleteBuild,
   checkCompatibility,
@@ -119,12 +148,16 @@ const apiService = {
   estimatePower,
   getCompatibleParts,
   getCompatiblePSUs,
+  openBuilderSession,
   adminCreateItem,
   adminUpdateItem,
   adminDeleteItem,
   adminUpdateAttribute,
   getPartCounts,
   getHighPowerBuilds,
+  getPartPopularity,
+  createJob,
+  getJob,
 };
 
 export default apiService;
@@ -47,7 +47,7 @@ const getLogoByManufacturer = (manufacturer) => {
   return '';
 };
 
-function PartChooser({ category, onPartSelect, onCancel, currentBuild }) {
+function PartChooser({ category, onPartSelect, onCancel, currentBuild, sessionOpen, sessionParts, sessionError, onCompatibleOnlyChange }) {
   const [parts, setParts] = useState([]);
   const [headers, setHeaders] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -66,6 +66,13 @@ function PartChooser({ category, onPartSelect, onCancel, currentBuild }) {
   const [compatibleOnly, setCompatibleOnly] = useState(false);
   const [isSearching, setIsSearching] = useState(false); // Used for search *or* compat filter
 
+  // Let the builder page subscribe to the session only while this view needs it
+  useEffect(() => {
+    if (!onCompatibleOnlyChange) return;
+    onCompatibleOnlyChange(compatibleOnly);
+    return () => onCompatibleOnlyChange(false);
+  }, [compatibleOnly, onCompatibleOnlyChange]);
+
   /**
    * This is the main data loading effect.
    * It now decides *what* to fetch based on the compatibleOnly toggle.
@@ -82,7 +89,21 @@ function PartChooser({ category, onPartSelect, onCancel, currentBuild }) {
         setIsSearching(true); // Treat this like a search (no pagination)
         setTotalPages(1);
 
-        if (category === 'psus') {
+        if (sessionOpen) {
+          // Kept up to date by the builder session (see BuilderPage);
+          // stay in the loading state until its first update (or error) arrives
+          if (sessionParts) {
+            setParts(sessionParts);
+            if (sessionParts.length > 0) {
+              setHeaders(Object.keys(sessionParts[0]));
+            }
+            setLoading(false);
+          } else if (sessionError) {
+            setParts([]);
+            setError(`Failed to load compatible parts: ${sessionError}`);
+            setLoading(false);
+          }
+        } else if (category === 'psus') {
           // Use new PSU compatibility API
           const gpuId = currentBuild.gpu?.id || null;
           const caseId = currentBuild.case?.id || null;
@@ -150,7 +171,7 @@ function PartChooser({ category, onPartSelect, onCancel, currentBuild }) {
     };
     
     loadParts();
-  }, [category, page, compatibleOnly, currentBuild]); // Re-run on all these changes
+  }, [category, page, compatibleOnly, currentBuild, sessionOpen, sessionParts, sessionError]); // Re-run on all these changes
 
 
   /**
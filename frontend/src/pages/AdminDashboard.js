@@ -16,6 +16,7 @@ function AdminDashboard() {
     const [selectedTable, setSelectedTable] = useState('cpus');
     const [tableData, setTableData] = useState([]);
     const [loading, setLoading] = useState(false);
+    const [buildsCursor, setBuildsCursor] = useState(null);
     // Default fields per table used when creating a new item (fallback when table is empty)
     const DEFAULT_FIELDS = {
         cpus: ['name','manufacturer','price','tdp','socket','core_count','core_clock','boost_clock','microarchitecture'],
@@ -48,49 +49,14 @@ function AdminDashboard() {
                 apiService.getHighPowerBuilds()
             ]);
 
-            // Also fetch all builds to compute popularity of parts chosen by users
-            let buildsRes = { data: { builds: [] } };
+            // Popularity of parts chosen by users, counted by the backend
             try {
-                buildsRes = await apiService.getAllBuildDetails();
+                const popularityRes = await apiService.getPartPopularity();
+                setPopularity(popularityRes.data.popularity || {});
             } catch (err) {
-                console.warn('Could not fetch builds for popularity:', err);
+                console.warn('Could not fetch part popularity:', err);
             }
 
-            // Compute popularity counts by part name
-            const counts = {
-                cpu: {},
-                gpu: {},
-                motherboard: {},
-                ram: {},
-                psu: {},
-                case: {},
-                ssd: {},
-                display: {}
-            };
-            const buildsList = buildsRes.data.builds || [];
-            buildsList.forEach(b => {
-                if (b.cpu) counts.cpu[b.cpu] = (counts.cpu[b.cpu] || 0) + 1;
-                if (b.gpu) counts.gpu[b.gpu] = (counts.gpu[b.gpu] || 0) + 1;
-                if (b.motherboard) counts.motherboard[b.motherboard] = (counts.motherboard[b.motherboard] || 0) + 1;
-                if (b.ram) counts.ram[b.ram] = (counts.ram[b.ram] || 0) + 1;
-                if (b.psu) counts.psu[b.psu] = (counts.psu[b.psu] || 0) + 1;
-                if (b.case_name) counts.case[b.case_name] = (counts.case[b.case_name] || 0) + 1;
-                if (b.ssd_name) counts.ssd[b.ssd_name] = (counts.ssd[b.ssd_name] || 0) + 1;
-                if (b.display_name) counts.display[b.display_name] = (counts.display[b.display_name] || 0) + 1;
-            });
-
-            const toSortedArray = (obj) => Object.entries(obj).map(([name, count]) => ({ name, count })).sort((a,b)=>b.count-a.count);
-            setPopularity({
-                cpu: toSortedArray(counts.cpu),
-                gpu: toSortedArray(counts.gpu),
-                motherboard: toSortedArray(counts.motherboard),
-                ram: toSortedArray(counts.ram),
-                psu: toSortedArray(counts.psu),
-                case: toSortedArray(counts.case),
-                ssd: toSortedArray(counts.ssd),
-                display: toSortedArray(counts.display),
-            });
-
             setStatistics({
                 partCounts: partCountsRes.data.part_counts,
                 highPowerBuilds: highPowerRes.data.high_power_builds,
@@ -109,11 +75,11 @@ function AdminDashboard() {
     const fetchTableData = async () => {
         setLoading(true);
         try {
-            // If viewing builds, use the dedicated endpoint which returns joined details
+            // If viewing builds, use the paginated listing which returns joined details
             if (selectedTable === 'builds') {
-                const res = await apiService.getAllBuildDetails();
-                // endpoint returns { builds: [...] }
+                const res = await apiService.listBuilds({ limit: 100 });
                 setTableData(res.data.builds || []);
+                setBuildsCursor(res.data.next_cursor);
             } else {
                 // For parts tables use the generic fetch (paginated)
                 const response = await apiService.fetchTable(selectedTable, 1, 500);
@@ -126,6 +92,16 @@ function AdminDashboard() {
         setLoading(false);
     };
 
+    const loadMoreBuilds = async () => {
+        try {
+            const res = await apiService.listBuilds({ limit: 100, cursor: buildsCursor });
+            setTableData(current => [...current, ...(res.data.builds || [])]);
+            setBuildsCursor(res.data.next_cursor);
+        } catch (error) {
+            console.error('Failed to fetch more builds:', error);
+        }
+    };
+
     const handleUpdateAttribute = async (itemId, column, value) => {
         try {
             await apiService.adminUpdateAttribute(selectedTable, itemId, column, value);
@@ -330,6 +306,15 @@ function AdminDashboard() {
                                     </tr>
                                 ))}
                             </tbody>
+                            {buildsCursor && (
+                                <tfoot>
+                                    <tr>
+                                        <td colSpan="9">
+                                            <button onClick={loadMoreBuilds}>Load More</button>
+                                        </td>
+                                    </tr>
+                                </tfoot>
+                            )}
                         </table>
                     ) : (
                         <table className="admin-table">
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate, useParams } from 'react-router-dom';
 import apiService from '../apiService';
 import PartChooser from '../components/PartChooser';
@@ -41,6 +41,9 @@ const COMPAT_MAP = {
   gpu_psu: 'GPU ↔ PSU Power',
 };
 
+// BuildState slots tracked by the /ws/builder session
+const SESSION_SLOTS = ['cpu_id', 'motherboard_id', 'ram_id', 'gpu_id', 'case_id', 'psu_id'];
+
 // The part categories your backend supports
 const PART_CATEGORIES = [
   { key: 'cpu', name: 'CPU', db_id: 'cpu_id', table: 'cpus' },
@@ -65,9 +68,106 @@ function BuilderPage() {
   const [totalTDP, setTotalTDP] = useState(0);
   const [compatibility, setCompatibility] = useState({});
   const [isLoading, setIsLoading] = useState(false);
+
+  // Builder session: server keeps the build state and pushes compatible-part
+  // diffs and check verdicts for whatever a part change affects
+  const sessionRef = useRef(null);
+  const [sessionOpen, setSessionOpen] = useState(false);
+  const [sessionParts, setSessionParts] = useState({});
+  const [sessionErrors, setSessionErrors] = useState({});
+  // Table currently subscribed for the open chooser, if any
+  const subscribedRef = useRef(null);
+  // Whether the open chooser is showing compatible parts only
+  const [compatibleView, setCompatibleView] = useState(false);
+
+  useEffect(() => {
+    const socket = apiService.openBuilderSession((message) => {
+      if (message.type !== 'update') {
+        const table = subscribedRef.current;
+        if (!table || !(message.categories || []).includes(table)) {
+          console.error('Builder session error', message);
+          return;
+        }
+        if (message.retry_after) {
+          // Throttled: ask again later; the server retries its pending work
+          setTimeout(() => {
+            if (subscribedRef.current === table && socket.readyState === WebSocket.OPEN) {
+              socket.send(JSON.stringify({ action: 'subscribe', categories: [table] }));
+            }
+          }, message.retry_after * 1000);
+        } else {
+          setSessionErrors(prev => ({ ...prev, [table]: message.detail }));
+        }
+        return;
+      }
+      setSessionParts(prev => {
+        const next = { ...prev };
+        for (const [table, { full, added, removed }] of Object.entries(message.compatible)) {
+          const removedIds = new Set(removed);
+          const kept = full ? [] : (prev[table] || []).filter(p => !removedIds.has(p.id));
+          const keptIds = new Set(kept.map(p => p.id));
+          next[table] = [...kept, ...added.filter(p => !keptIds.has(p.id))];
+        }
+        return next;
+      });
+      setSessionErrors(prev => {
+        const next = { ...prev };
+        Object.keys(message.compatible).forEach(table => delete next[table]);
+        return next;
+      });
+      setCompatibility(prev => {
+        const next = { ...prev };
+        for (const [key, verdict] of Object.entries(message.checks)) {
+          if (verdict) {
+            next[key] = verdict;
+          } else {
+            delete next[key];
+          }
+        }
+        return next;
+      });
+    });
+    socket.onopen = () => setSessionOpen(true);
+    socket.onclose = () => setSessionOpen(false);
+    sessionRef.current = socket;
+    return () => socket.close();
+  }, []);
+
+  // Push part changes to the session; it only recomputes what they affect
+  useEffect(() => {
+    if (!sessionOpen) return;
+    const parts = {};
+    SESSION_SLOTS.forEach(slot => {
+      const cat = PART_CATEGORIES.find(c => c.db_id === slot);
+      parts[slot] = selectedParts[cat.key] ? selectedParts[cat.key].id : null;
+    });
+    sessionRef.current.send(JSON.stringify({ action: 'set', parts }));
+  }, [selectedParts, sessionOpen]);
+
+  // Keep the open chooser's compatible list subscribed while it is shown
+  useEffect(() => {
+    if (!sessionOpen || !choosingCategory || !compatibleView) return;
+    const table = choosingCategory.table;
+    subscribedRef.current = table;
+    sessionRef.current.send(JSON.stringify({ action: 'subscribe', categories: [table] }));
+    return () => {
+      subscribedRef.current = null;
+      if (sessionRef.current.readyState === WebSocket.OPEN) {
+        sessionRef.current.send(JSON.stringify({ action: 'unsubscribe', categories: [table] }));
+      }
+      const drop = prev => {
+        const next = { ...prev };
+        delete next[table];
+        return next;
+      };
+      setSessionParts(drop);
+      setSessionErrors(drop);
+    };
+  }, [choosingCategory, compatibleView, sessionOpen]);
   
-  // === EFFECT FOR COMPATIBILITY (CHECKS ALL PAIRS) ===
+  // === EFFECT FOR COMPATIBILITY (REST FALLBACK WHEN NO SESSION) ===
   useEffect(() => {
+    if (sessionOpen) return;
     const checkCompat = async () => {
       let newCompat = {}; // Start fresh to remove stale checks
       
@@ -99,7 +199,7 @@ function BuilderPage() {
     };
 
     checkCompat();
-  }, [selectedParts]); // Re-run whenever parts change
+  }, [selectedParts, sessionOpen]); // Re-run whenever parts change
 
   // === EFFECT FOR REAL-TIME TDP (UPDATED) ===
   useEffect(() => {
@@ -371,6 +471,10 @@ function BuilderPage() {
           onPartSelect={handlePartSelected}
           onCancel={() => setChoosingCategory(null)}
           currentBuild={selectedParts}
+          sessionOpen={sessionOpen}
+          sessionParts={sessionParts[choosingCategory.table]}
+          sessionError={sessionErrors[choosingCategory.table]}
+          onCompatibleOnlyChange={setCompatibleView}
         />
       )}
       
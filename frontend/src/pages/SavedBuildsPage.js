@@ -3,92 +3,50 @@ import apiService from '../apiService';
 import { Link } from 'react-router-dom';
 import './Table.css';
 
+const PAGE_SIZE = 20;
+
 function SavedBuildsPage() {
     const [builds, setBuilds] = useState([]);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [error, setError] = useState('');
+    const [nextCursor, setNextCursor] = useState(null);
+    const [sortBy, setSortBy] = useState('created_at');
+    const [order, setOrder] = useState('desc');
 
     useEffect(() => {
         loadBuilds();
-    }, []);
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, [sortBy, order]);
 
-    const loadBuilds = async () => {
-        setLoading(true);
-        try {
-            const response = await apiService.getAllBuildDetails();
-            
-            // Fetch all parts data in parallel
-            const [cpus, gpus, mobos, rams, psus, cases, ssds, displays] = await Promise.all([
-                apiService.fetchTable('cpus'),
-                apiService.fetchTable('gpus'),
-                apiService.fetchTable('motherboards'),
-                apiService.fetchTable('ram'),
-                apiService.fetchTable('psus'),
-                apiService.fetchTable('cases'),
-                apiService.fetchTable('ssds'),
-                apiService.fetchTable('displays')
-            ]).then(responses => responses.map(r => r.data.data || []));
-
-            console.log('Parts data loaded:', { 
-                cpus: cpus.length, 
-                gpus: gpus.length,
-                mobos: mobos.length,
-                rams: rams.length,
-                psus: psus.length,
-                cases: cases.length,
-                ssds: ssds.length,
-                displays: displays.length
-            });
-
-            const findPrice = (list, name) => {
-                const item = list.find(item => item.name === name);
-                const priceUSD = parseFloat(item?.price || 0);
-                return isNaN(priceUSD) ? 0 : Math.round(priceUSD * 83);
-            };
-
-            const buildsWithPrices = response.data.builds.map(build => {
-                const prices = {
-                    cpu: build.cpu ? findPrice(cpus, build.cpu) : 0,
-                    gpu: build.gpu ? findPrice(gpus, build.gpu) : 0,
-                    motherboard: build.motherboard ? findPrice(mobos, build.motherboard) : 0,
-                    ram: build.ram ? findPrice(rams, build.ram) : 0,
-                    psu: build.psu ? findPrice(psus, build.psu) : 0,
-                    case: build.case_name ? findPrice(cases, build.case_name) : 0,
-                    ssd: build.ssd_name ? findPrice(ssds, build.ssd_name) : 0,
-                    display: build.display_name ? findPrice(displays, build.display_name) : 0
-                };
+    // Convert the build's total USD price to INR (approximately ₹83 per USD)
+    const toINR = (priceUSD) => {
+        const price = parseFloat(priceUSD || 0);
+        return isNaN(price) ? 0 : Math.round(price * 83);
+    };
 
-                console.log(`Build ${build.build_id} (${build.build_name}) prices:`, prices);
-                
-                return {
-                    ...build,
-                    prices
-                };
+    const loadBuilds = async (cursor = null) => {
+        if (cursor) {
+            setLoadingMore(true);
+        } else {
+            setLoading(true);
+        }
+        try {
+            const response = await apiService.listBuilds({
+                sort_by: sortBy,
+                order,
+                limit: PAGE_SIZE,
+                ...(cursor ? { cursor } : {})
             });
-            
-            console.log('Builds with prices:', buildsWithPrices);
-            setBuilds(buildsWithPrices);
-            setLoading(false);
+            const page = response.data.builds || [];
+            setBuilds(currentBuilds => cursor ? [...currentBuilds, ...page] : page);
+            setNextCursor(response.data.next_cursor);
         } catch (err) {
             console.error("Failed to fetch builds", err);
             setError('Failed to fetch builds.');
+        } finally {
             setLoading(false);
-        }
-    };
-
-    const fetchPartPrice = async (category, partName) => {
-        if (!partName) return 0;
-        try {
-            const response = await apiService.fetchTable(category);
-            const part = response.data.data?.find(p => p.name === partName);
-            // Convert USD to INR (approximately ₹83 per USD as of Nov 2023)
-            const priceUSD = part?.price || 0;
-            const priceINR = Math.round(priceUSD * 83);
-            console.log(`Price for ${partName}: $${priceUSD} = ₹${priceINR}`); // Debug log
-            return priceINR;
-        } catch (error) {
-            console.error(`Failed to fetch price for ${partName}:`, error);
-            return 0;
+            setLoadingMore(false);
         }
     };
 
@@ -115,7 +73,18 @@ function SavedBuildsPage() {
         <div className="saved-builds-page">
             <div className="page-header">
                 <h2>My Saved Builds</h2>
-                <Link to="/builder" className="create-build-btn">Create New Build</Link>
+                <div className="action-buttons">
+                    <select value={sortBy} onChange={e => setSortBy(e.target.value)}>
+                        <option value="created_at">Created Date</option>
+                        <option value="total_price">Total Value</option>
+                        <option value="total_power_estimate">Power Estimate</option>
+                    </select>
+                    <select value={order} onChange={e => setOrder(e.target.value)}>
+                        <option value="desc">Descending</option>
+                        <option value="asc">Ascending</option>
+                    </select>
+                    <Link to="/builder" className="create-build-btn">Create New Build</Link>
+                </div>
             </div>
             
             {builds.length === 0 ? (
@@ -143,8 +112,7 @@ function SavedBuildsPage() {
                         </thead>
                         <tbody>
                             {builds.map(build => {
-                                // Get the parts data from the build
-                                const totalValue = Object.values(build.prices || {}).reduce((sum, price) => sum + (price || 0), 0);
+                                const totalValue = toINR(build.total_price);
 
                                 return (
                                     <tr key={build.build_id}>
@@ -180,6 +148,15 @@ function SavedBuildsPage() {
                             })}
                         </tbody>
                     </table>
+                    {nextCursor && (
+                        <button
+                            onClick={() => loadBuilds(nextCursor)}
+                            className="create-build-btn"
+                            disabled={loadingMore}
+                        >
+                            {loadingMore ? 'Loading...' : 'Load More'}
+                        </button>
+                    )}
                 </div>
             )}
         </div>